@@ -4,7 +4,6 @@ from .convert import ConvertResult, to_dxf
 from .document import Document, Layout, read
 from .entity import Entity
 from . import raw
-from .render import plot
 
 __all__ = [
     "read",
@@ -18,6 +17,15 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str):
+    if name == "plot":
+        from .render import plot
+
+        globals()["plot"] = plot
+        return plot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     from ezdwg.cli import main as cli_main
 
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import fnmatch
+import heapq
 import math
+import os
 import re
+from collections import Counter, OrderedDict, defaultdict
 from functools import lru_cache
+from itertools import chain, islice
+from operator import itemgetter
 from dataclasses import dataclass
-from typing import Iterable, Iterator
+from typing import Callable, Iterable, Iterator, NamedTuple
 
 from . import raw
 from .entity import Entity
@@ -48,17 +53,57 @@ TYPE_ALIASES = {
     "DIM_ANG2LN": "DIMENSION",
 }
 
-_BULK_PRIMITIVE_TYPES = {"LINE", "ARC", "CIRCLE"}
+_DIMENSION_DECODERS = (
+    ("LINEAR", "decode_dim_linear_entities"),
+    ("ORDINATE", "decode_dim_ordinate_entities"),
+    ("ALIGNED", "decode_dim_aligned_entities"),
+    ("ANG3PT", "decode_dim_ang3pt_entities"),
+    ("ANG2LN", "decode_dim_ang2ln_entities"),
+    ("RADIUS", "decode_dim_radius_entities"),
+    ("DIAMETER", "decode_dim_diameter_entities"),
+)
+_SUPPORTED_ENTITY_TYPE_SET = frozenset(SUPPORTED_ENTITY_TYPES)
+_BULK_PRIMITIVE_DECODERS = (
+    ("LINE", "decode_line_entities"),
+    ("ARC", "decode_arc_entities"),
+    ("CIRCLE", "decode_circle_entities"),
+)
+_RAD2DEG = 180.0 / math.pi
+_BYLAYER_INDICES = frozenset({None, 0, 256, 257})
+_EMPTY_HANDLES: frozenset[int] = frozenset()
+_FileStamp = tuple[int, int] | None
+_DECODED_ROWS: OrderedDict[tuple[str, str, _FileStamp], tuple] = OrderedDict()
+_DECODED_ROWS_MAXSIZE = 128
+_TYPE_SPLIT_RE = re.compile(r"[,\s]+")
+_ALL_TYPE_TOKENS = frozenset({"*", "ALL"})
+_HAS_GLOB = re.compile(r"[*?\[\]]").search
+_MTEXT_TOKEN_RE = re.compile(
+    r"\\(?:[Uu]\+([0-9A-Fa-f]{4})|S([^;]*);?|[ACcFfHhQqTtWwp][^;]*;?|(.))|[{}]",
+    re.DOTALL,
+)
+_MTEXT_BRACE_STRIP = str.maketrans("", "", "{}")
+_MTEXT_STACK_SEPARATORS = str.maketrans("#^", "//")
+_MTEXT_ESCAPES = {
+    "P": "\n",
+    "X": "\n",
+    "~": " ",
+    "L": "",
+    "l": "",
+    "O": "",
+    "o": "",
+    "K": "",
+    "k": "",
+}
 
 
 def read(path: str) -> "Document":
-    version = raw.detect_version(path)
+    version = _detect_version(path, _file_stamp(path))
     if version not in SUPPORTED_VERSIONS:
         raise ValueError(f"unsupported DWG version: {version}")
     return Document(path=path, version=version)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Document:
     path: str
     version: str
@@ -88,8 +133,15 @@ class Document:
     def raw(self):
         return raw
 
+    @staticmethod
+    def clear_cache() -> None:
+        _DECODED_ROWS.clear()
+        _detect_version.cache_clear()
+        _color_context.cache_clear()
+        _present_supported_types.cache_clear()
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Layout:
     doc: Document
     name: str
@@ -98,12 +150,19 @@ class Layout:
         return self.query(types)
 
     def query(self, types: str | Iterable[str] | None = None) -> Iterator[Entity]:
-        type_set = _normalize_types(types, self.doc.decode_path)
-        bulk_rows = None
-        if sum(1 for dxftype in type_set if dxftype in _BULK_PRIMITIVE_TYPES) >= 2:
-            bulk_rows = _line_arc_circle_rows(self.doc.decode_path)
-        for dxftype in type_set:
-            yield from self._iter_type(dxftype, bulk_rows=bulk_rows)
+        return chain.from_iterable(self._iter_groups(types))
+
+    def entities(self, types: str | Iterable[str] | None = None) -> list[Entity]:
+        return list(chain.from_iterable(self._iter_groups(types)))
+
+    def iter_batches(
+        self, types: str | Iterable[str] | None = None, batch: int = 1024
+    ) -> Iterator[tuple[Entity, ...]]:
+        if batch < 1:
+            raise ValueError(f"batch must be >= 1: {batch}")
+        entities = self.query(types)
+        while chunk := tuple(islice(entities, batch)):
+            yield chunk
 
     def plot(self, *args, **kwargs):
         from .render import plot
@@ -115,967 +174,891 @@ class Layout:
 
         return to_dxf(self, output_path, **kwargs)
 
-    def _iter_type(
-        self,
-        dxftype: str,
-        *,
-        bulk_rows: tuple[
-            list[tuple[int, float, float, float, float, float, float]],
-            list[tuple[int, float, float, float, float, float, float]],
-            list[tuple[int, float, float, float, float]],
-        ]
-        | None = None,
-    ) -> Iterator[Entity]:
+    def _iter_groups(
+        self, types: str | Iterable[str] | None
+    ) -> Iterator[Iterator[Entity]]:
+        decode_path = self.doc.decode_path
+        stamp = _file_stamp(decode_path)
+        type_set = _normalize_types(types, decode_path, stamp)
+        _prefetch_line_arc_circle_rows(decode_path, stamp, type_set)
+        for dxftype in type_set:
+            yield self._iter_type(dxftype, stamp)
+
+    def _iter_type(self, dxftype: str, stamp: _FileStamp) -> Iterator[Entity]:
+        try:
+            handler = _TYPE_DISPATCH[dxftype]
+        except KeyError:
+            raise ValueError(
+                f"unsupported entity type: {dxftype}. "
+                f"Supported types: {', '.join(SUPPORTED_ENTITY_TYPES)}"
+            ) from None
         decode_path = self.doc.decode_path
-        entity_style_map = _entity_style_map(decode_path)
-        layer_color_map = _layer_color_map(decode_path)
-        layer_color_overrides = _layer_color_overrides(
-            self.doc.decode_version, entity_style_map, layer_color_map
+        entity_style_map, layer_color_map, layer_color_overrides = _color_context(
+            decode_path, self.doc.decode_version, stamp
+        )
+        attach_color = _entity_color_attacher(
+            entity_style_map, layer_color_map, layer_color_overrides, dxftype
         )
-        if dxftype == "LINE":
-            if bulk_rows is not None:
-                line_rows = bulk_rows[0]
-            else:
-                line_rows = list(raw.decode_line_entities(decode_path))
-            line_supplementary_handles = _line_supplementary_handles(
-                line_rows, entity_style_map, layer_color_overrides
+        yield from handler(
+            _EntityContext(
+                decode_path,
+                stamp,
+                attach_color,
+                entity_style_map,
+                layer_color_overrides,
             )
-            for handle, sx, sy, sz, ex, ey, ez in line_rows:
-                dxf = _attach_entity_color(
-                    handle,
-                    {
-                        "start": (sx, sy, sz),
-                        "end": (ex, ey, ez),
-                    },
-                    entity_style_map,
-                    layer_color_map,
-                    layer_color_overrides,
-                    dxftype="LINE",
-                )
-                if handle in line_supplementary_handles:
-                    dxf["resolved_color_index"] = 9
-                    dxf["resolved_true_color"] = None
-                yield Entity(
-                    dxftype="LINE",
-                    handle=handle,
-                    dxf=dxf,
-                )
-            return
-
-        if dxftype == "ARC":
-            arc_rows = bulk_rows[1] if bulk_rows is not None else raw.decode_arc_entities(decode_path)
-            for handle, cx, cy, cz, radius, start_angle, end_angle in arc_rows:
-                start_deg = math.degrees(start_angle)
-                end_deg = math.degrees(end_angle)
-                yield Entity(
-                    dxftype="ARC",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "center": (cx, cy, cz),
-                            "radius": radius,
-                            "start_angle": start_deg,
-                            "end_angle": end_deg,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="ARC",
-                    ),
-                )
-            return
-
-        if dxftype == "LWPOLYLINE":
-            for (
+        )
+
+
+class _EntityContext(NamedTuple):
+    path: str
+    stamp: _FileStamp
+    attach_color: Callable[[int, dict], dict]
+    entity_style_map: dict[int, tuple[int | None, int | None, int]]
+    layer_color_overrides: dict[int, tuple[int, int | None]]
+
+    def rows(self, decoder_name: str) -> tuple:
+        return _decoded_rows(decoder_name, self.path, self.stamp)
+
+
+def _iter_line(ctx: _EntityContext) -> Iterator[Entity]:
+    line_rows = ctx.rows("decode_line_entities")
+    line_supplementary_handles = _line_supplementary_handles(
+        line_rows, ctx.entity_style_map, ctx.layer_color_overrides
+    )
+    for handle, sx, sy, sz, ex, ey, ez in line_rows:
+        dxf = ctx.attach_color(
+            handle,
+            {
+                "start": (sx, sy, sz),
+                "end": (ex, ey, ez),
+            },
+        )
+        if handle in line_supplementary_handles:
+            dxf["resolved_color_index"] = 9
+            dxf["resolved_true_color"] = None
+        yield Entity(
+            dxftype="LINE",
+            handle=handle,
+            dxf=dxf,
+        )
+
+
+def _iter_arc(ctx: _EntityContext) -> Iterator[Entity]:
+    for handle, cx, cy, cz, radius, start_angle, end_angle in ctx.rows(
+        "decode_arc_entities"
+    ):
+        start_deg = start_angle * _RAD2DEG
+        end_deg = end_angle * _RAD2DEG
+        yield Entity(
+            dxftype="ARC",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                flags,
-                points,
-                bulges,
-                widths,
-                const_width,
-            ) in raw.decode_lwpolyline_entities(decode_path):
-                points3d = [(x, y, 0.0) for x, y in points]
-                bulges_list = list(bulges)
-                if len(bulges_list) < len(points3d):
-                    bulges_list.extend([0.0] * (len(points3d) - len(bulges_list)))
-                elif len(bulges_list) > len(points3d):
-                    bulges_list = bulges_list[: len(points3d)]
-
-                widths_list = list(widths)
-                if not widths_list and const_width is not None and points3d:
-                    widths_list = [(const_width, const_width)] * len(points3d)
-                if len(widths_list) < len(points3d):
-                    widths_list.extend([(0.0, 0.0)] * (len(points3d) - len(widths_list)))
-                elif len(widths_list) > len(points3d):
-                    widths_list = widths_list[: len(points3d)]
-                yield Entity(
-                    dxftype="LWPOLYLINE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "points": points3d,
-                            "flags": flags,
-                            "closed": bool(flags & 1),
-                            "bulges": bulges_list,
-                            "widths": widths_list,
-                            "const_width": const_width,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="LWPOLYLINE",
-                    ),
-                )
-            return
-
-        if dxftype == "POLYLINE_3D":
-            for handle, flags_70_bits, closed, points in raw.decode_polyline_3d_with_vertices(
-                decode_path
-            ):
-                yield Entity(
-                    dxftype="POLYLINE_3D",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "points": list(points),
-                            "flags": int(flags_70_bits),
-                            "closed": bool(closed),
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="POLYLINE_3D",
-                    ),
-                )
-            return
-
-        if dxftype == "POLYLINE_MESH":
-            for (
+                {
+                    "center": (cx, cy, cz),
+                    "radius": radius,
+                    "start_angle": start_deg,
+                    "end_angle": end_deg,
+                },
+            ),
+        )
+
+
+def _iter_lwpolyline(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        flags,
+        points,
+        bulges,
+        widths,
+        const_width,
+    ) in ctx.rows("decode_lwpolyline_entities"):
+        points3d = [(x, y, 0.0) for x, y in points]
+        count = len(points3d)
+        bulges_list = list(bulges[:count])
+        if len(bulges_list) < count:
+            bulges_list.extend([0.0] * (count - len(bulges_list)))
+
+        if not widths and const_width is not None and count:
+            widths_list = [(const_width, const_width)] * count
+        else:
+            widths_list = list(widths[:count])
+            if len(widths_list) < count:
+                widths_list.extend([(0.0, 0.0)] * (count - len(widths_list)))
+        yield Entity(
+            dxftype="LWPOLYLINE",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                flags,
-                m_vertex_count,
-                n_vertex_count,
-                closed,
-                points,
-            ) in raw.decode_polyline_mesh_with_vertices(decode_path):
-                yield Entity(
-                    dxftype="POLYLINE_MESH",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "points": list(points),
-                            "flags": int(flags),
-                            "m_vertex_count": int(m_vertex_count),
-                            "n_vertex_count": int(n_vertex_count),
-                            "closed": bool(closed),
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="POLYLINE_MESH",
-                    ),
-                )
-            return
-
-        if dxftype == "POLYLINE_PFACE":
-            for (
+                {
+                    "points": points3d,
+                    "flags": flags,
+                    "closed": bool(flags & 1),
+                    "bulges": bulges_list,
+                    "widths": widths_list,
+                    "const_width": const_width,
+                },
+            ),
+        )
+
+
+def _iter_polyline_3d(ctx: _EntityContext) -> Iterator[Entity]:
+    for handle, flags_70_bits, closed, points in ctx.rows(
+        "decode_polyline_3d_with_vertices"
+    ):
+        yield Entity(
+            dxftype="POLYLINE_3D",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                num_vertices,
-                num_faces,
-                vertices,
-                faces,
-            ) in raw.decode_polyline_pface_with_faces(decode_path):
-                yield Entity(
-                    dxftype="POLYLINE_PFACE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "num_vertices": int(num_vertices),
-                            "num_faces": int(num_faces),
-                            "vertices": list(vertices),
-                            "faces": list(faces),
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="POLYLINE_PFACE",
-                    ),
-                )
-            return
-
-        if dxftype == "3DFACE":
-            for handle, p1, p2, p3, p4, invisible_edge_flags in raw.decode_3dface_entities(
-                decode_path
-            ):
-                yield Entity(
-                    dxftype="3DFACE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "points": [p1, p2, p3, p4],
-                            "invisible_edge_flags": int(invisible_edge_flags),
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="3DFACE",
-                    ),
-                )
-            return
-
-        if dxftype == "SOLID":
-            for handle, p1, p2, p3, p4, thickness, extrusion in raw.decode_solid_entities(
-                decode_path
-            ):
-                yield Entity(
-                    dxftype="SOLID",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "points": [p1, p2, p3, p4],
-                            "thickness": thickness,
-                            "extrusion": extrusion,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="SOLID",
-                    ),
-                )
-            return
-
-        if dxftype == "TRACE":
-            for handle, p1, p2, p3, p4, thickness, extrusion in raw.decode_trace_entities(
-                decode_path
-            ):
-                yield Entity(
-                    dxftype="TRACE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "points": [p1, p2, p3, p4],
-                            "thickness": thickness,
-                            "extrusion": extrusion,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="TRACE",
-                    ),
-                )
-            return
-
-        if dxftype == "SHAPE":
-            for (
+                {
+                    "points": list(points),
+                    "flags": int(flags_70_bits),
+                    "closed": bool(closed),
+                },
+            ),
+        )
+
+
+def _iter_polyline_mesh(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        flags,
+        m_vertex_count,
+        n_vertex_count,
+        closed,
+        points,
+    ) in ctx.rows("decode_polyline_mesh_with_vertices"):
+        yield Entity(
+            dxftype="POLYLINE_MESH",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                insertion,
-                scale,
-                rotation,
-                width_factor,
-                oblique,
-                thickness,
-                shape_no,
-                extrusion,
-                shapefile_handle,
-            ) in raw.decode_shape_entities(decode_path):
-                yield Entity(
-                    dxftype="SHAPE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "insert": insertion,
-                            "scale": scale,
-                            "rotation": math.degrees(rotation),
-                            "width": width_factor,
-                            "oblique": math.degrees(oblique),
-                            "thickness": thickness,
-                            "shape_no": int(shape_no),
-                            "extrusion": extrusion,
-                            "shapefile_handle": shapefile_handle,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="SHAPE",
-                    ),
-                )
-            return
-
-        if dxftype == "POINT":
-            for handle, x, y, z, angle in raw.decode_point_entities(decode_path):
-                yield Entity(
-                    dxftype="POINT",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "location": (x, y, z),
-                            "x_axis_angle": angle,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="POINT",
-                    ),
-                )
-            return
-
-        if dxftype == "CIRCLE":
-            if bulk_rows is not None:
-                circle_rows = bulk_rows[2]
-            else:
-                circle_rows = list(raw.decode_circle_entities(decode_path))
-            circle_supplementary_handles = _circle_supplementary_handles(
-                circle_rows, entity_style_map, layer_color_overrides
-            )
-            for handle, cx, cy, cz, radius in circle_rows:
-                dxf = _attach_entity_color(
-                    handle,
-                    {
-                        "center": (cx, cy, cz),
-                        "radius": radius,
-                    },
-                    entity_style_map,
-                    layer_color_map,
-                    layer_color_overrides,
-                    dxftype="CIRCLE",
-                )
-                if handle in circle_supplementary_handles:
-                    dxf["resolved_color_index"] = 9
-                    dxf["resolved_true_color"] = None
-                yield Entity(
-                    dxftype="CIRCLE",
-                    handle=handle,
-                    dxf=dxf,
-                )
-            return
-
-        if dxftype == "ELLIPSE":
-            for (
+                {
+                    "points": list(points),
+                    "flags": int(flags),
+                    "m_vertex_count": int(m_vertex_count),
+                    "n_vertex_count": int(n_vertex_count),
+                    "closed": bool(closed),
+                },
+            ),
+        )
+
+
+def _iter_polyline_pface(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        num_vertices,
+        num_faces,
+        vertices,
+        faces,
+    ) in ctx.rows("decode_polyline_pface_with_faces"):
+        yield Entity(
+            dxftype="POLYLINE_PFACE",
+            handle=handle,
+            dxf=ctx.attach_color(
+                handle,
+                {
+                    "num_vertices": int(num_vertices),
+                    "num_faces": int(num_faces),
+                    "vertices": list(vertices),
+                    "faces": list(faces),
+                },
+            ),
+        )
+
+
+def _iter_3dface(ctx: _EntityContext) -> Iterator[Entity]:
+    for handle, p1, p2, p3, p4, invisible_edge_flags in ctx.rows(
+        "decode_3dface_entities"
+    ):
+        yield Entity(
+            dxftype="3DFACE",
+            handle=handle,
+            dxf=ctx.attach_color(
+                handle,
+                {
+                    "points": [p1, p2, p3, p4],
+                    "invisible_edge_flags": int(invisible_edge_flags),
+                },
+            ),
+        )
+
+
+def _iter_solid(ctx: _EntityContext) -> Iterator[Entity]:
+    for handle, p1, p2, p3, p4, thickness, extrusion in ctx.rows(
+        "decode_solid_entities"
+    ):
+        yield Entity(
+            dxftype="SOLID",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                center,
-                major_axis,
-                extrusion,
-                axis_ratio,
-                start_angle,
-                end_angle,
-            ) in raw.decode_ellipse_entities(decode_path):
-                yield Entity(
-                    dxftype="ELLIPSE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "center": center,
-                            "major_axis": major_axis,
-                            "extrusion": extrusion,
-                            "axis_ratio": axis_ratio,
-                            "start_angle": start_angle,
-                            "end_angle": end_angle,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="ELLIPSE",
-                    ),
-                )
-            return
-
-        if dxftype == "SPLINE":
-            for (
+                {
+                    "points": [p1, p2, p3, p4],
+                    "thickness": thickness,
+                    "extrusion": extrusion,
+                },
+            ),
+        )
+
+
+def _iter_trace(ctx: _EntityContext) -> Iterator[Entity]:
+    for handle, p1, p2, p3, p4, thickness, extrusion in ctx.rows(
+        "decode_trace_entities"
+    ):
+        yield Entity(
+            dxftype="TRACE",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                flags_data,
-                tolerance_data,
-                knots,
-                control_points,
-                weights,
-                fit_points,
-            ) in raw.decode_spline_entities(decode_path):
-                scenario, degree, rational, closed, periodic = flags_data
-                fit_tolerance, knot_tolerance, ctrl_tolerance = tolerance_data
-                points = list(fit_points if len(fit_points) >= 2 else control_points)
-                if closed and len(points) > 1 and points[0] != points[-1]:
-                    points.append(points[0])
-                yield Entity(
-                    dxftype="SPLINE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "scenario": scenario,
-                            "degree": degree,
-                            "rational": bool(rational),
-                            "closed": bool(closed),
-                            "periodic": bool(periodic),
-                            "fit_tolerance": fit_tolerance,
-                            "knot_tolerance": knot_tolerance,
-                            "ctrl_tolerance": ctrl_tolerance,
-                            "knots": list(knots),
-                            "control_points": list(control_points),
-                            "weights": list(weights),
-                            "fit_points": list(fit_points),
-                            "points": points,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="SPLINE",
-                    ),
-                )
-            return
-
-        if dxftype == "TEXT":
-            for (
+                {
+                    "points": [p1, p2, p3, p4],
+                    "thickness": thickness,
+                    "extrusion": extrusion,
+                },
+            ),
+        )
+
+
+def _iter_shape(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        insertion,
+        scale,
+        rotation,
+        width_factor,
+        oblique,
+        thickness,
+        shape_no,
+        extrusion,
+        shapefile_handle,
+    ) in ctx.rows("decode_shape_entities"):
+        yield Entity(
+            dxftype="SHAPE",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                text,
-                insertion,
-                alignment,
-                extrusion,
-                metrics,
-                align_flags,
-                style_handle,
-            ) in raw.decode_text_entities(decode_path):
-                thickness, oblique_angle, height, rotation, width_factor = metrics
-                generation, horizontal_alignment, vertical_alignment = align_flags
-                yield Entity(
-                    dxftype="TEXT",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "text": text,
-                            "insert": insertion,
-                            "align_point": alignment,
-                            "extrusion": extrusion,
-                            "thickness": thickness,
-                            "oblique": math.degrees(oblique_angle),
-                            "height": height,
-                            "rotation": math.degrees(rotation),
-                            "width": width_factor,
-                            "text_generation_flag": generation,
-                            "halign": horizontal_alignment,
-                            "valign": vertical_alignment,
-                            "style_handle": style_handle,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="TEXT",
-                    ),
-                )
-            return
-
-        if dxftype == "ATTRIB":
-            for (
+                {
+                    "insert": insertion,
+                    "scale": scale,
+                    "rotation": rotation * _RAD2DEG,
+                    "width": width_factor,
+                    "oblique": oblique * _RAD2DEG,
+                    "thickness": thickness,
+                    "shape_no": int(shape_no),
+                    "extrusion": extrusion,
+                    "shapefile_handle": shapefile_handle,
+                },
+            ),
+        )
+
+
+def _iter_point(ctx: _EntityContext) -> Iterator[Entity]:
+    for handle, x, y, z, angle in ctx.rows("decode_point_entities"):
+        yield Entity(
+            dxftype="POINT",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                text,
-                tag,
-                prompt,
-                insertion,
-                alignment,
-                extrusion,
-                metrics,
-                align_flags,
-                attrib_flags,
-                lock_position,
-                style_handle,
-            ) in raw.decode_attrib_entities(decode_path):
-                thickness, oblique_angle, height, rotation, width_factor = metrics
-                generation, horizontal_alignment, vertical_alignment = align_flags
-                yield Entity(
-                    dxftype="ATTRIB",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "text": text,
-                            "tag": tag,
-                            "prompt": prompt,
-                            "insert": insertion,
-                            "align_point": alignment,
-                            "extrusion": extrusion,
-                            "thickness": thickness,
-                            "oblique": math.degrees(oblique_angle),
-                            "height": height,
-                            "rotation": math.degrees(rotation),
-                            "width": width_factor,
-                            "text_generation_flag": generation,
-                            "halign": horizontal_alignment,
-                            "valign": vertical_alignment,
-                            "style_handle": style_handle,
-                            "attribute_flags": int(attrib_flags),
-                            "lock_position": bool(lock_position),
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="ATTRIB",
-                    ),
-                )
-            return
-
-        if dxftype == "ATTDEF":
-            for (
+                {
+                    "location": (x, y, z),
+                    "x_axis_angle": angle,
+                },
+            ),
+        )
+
+
+def _iter_circle(ctx: _EntityContext) -> Iterator[Entity]:
+    circle_rows = ctx.rows("decode_circle_entities")
+    circle_supplementary_handles = _circle_supplementary_handles(
+        circle_rows, ctx.entity_style_map, ctx.layer_color_overrides
+    )
+    for handle, cx, cy, cz, radius in circle_rows:
+        dxf = ctx.attach_color(
+            handle,
+            {
+                "center": (cx, cy, cz),
+                "radius": radius,
+            },
+        )
+        if handle in circle_supplementary_handles:
+            dxf["resolved_color_index"] = 9
+            dxf["resolved_true_color"] = None
+        yield Entity(
+            dxftype="CIRCLE",
+            handle=handle,
+            dxf=dxf,
+        )
+
+
+def _iter_ellipse(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        center,
+        major_axis,
+        extrusion,
+        axis_ratio,
+        start_angle,
+        end_angle,
+    ) in ctx.rows("decode_ellipse_entities"):
+        yield Entity(
+            dxftype="ELLIPSE",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                text,
-                tag,
-                prompt,
-                insertion,
-                alignment,
-                extrusion,
-                metrics,
-                align_flags,
-                attrib_flags,
-                lock_position,
-                style_handle,
-            ) in raw.decode_attdef_entities(decode_path):
-                thickness, oblique_angle, height, rotation, width_factor = metrics
-                generation, horizontal_alignment, vertical_alignment = align_flags
-                yield Entity(
-                    dxftype="ATTDEF",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "text": text,
-                            "tag": tag,
-                            "prompt": prompt,
-                            "insert": insertion,
-                            "align_point": alignment,
-                            "extrusion": extrusion,
-                            "thickness": thickness,
-                            "oblique": math.degrees(oblique_angle),
-                            "height": height,
-                            "rotation": math.degrees(rotation),
-                            "width": width_factor,
-                            "text_generation_flag": generation,
-                            "halign": horizontal_alignment,
-                            "valign": vertical_alignment,
-                            "style_handle": style_handle,
-                            "attribute_flags": int(attrib_flags),
-                            "lock_position": bool(lock_position),
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="ATTDEF",
-                    ),
-                )
-            return
-
-        if dxftype == "MTEXT":
-            for (
+                {
+                    "center": center,
+                    "major_axis": major_axis,
+                    "extrusion": extrusion,
+                    "axis_ratio": axis_ratio,
+                    "start_angle": start_angle,
+                    "end_angle": end_angle,
+                },
+            ),
+        )
+
+
+def _iter_spline(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        flags_data,
+        tolerance_data,
+        knots,
+        control_points,
+        weights,
+        fit_points,
+    ) in ctx.rows("decode_spline_entities"):
+        scenario, degree, rational, closed, periodic = flags_data
+        fit_tolerance, knot_tolerance, ctrl_tolerance = tolerance_data
+        points = list(fit_points if len(fit_points) >= 2 else control_points)
+        if closed and len(points) > 1 and points[0] != points[-1]:
+            points.append(points[0])
+        yield Entity(
+            dxftype="SPLINE",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                text,
-                insertion,
-                extrusion,
-                x_axis_dir,
-                rect_width,
-                text_height,
-                attachment,
-                drawing_dir,
-                background_data,
-            ) in raw.decode_mtext_entities(decode_path):
-                (
-                    background_flags,
-                    background_scale_factor,
-                    background_color_index,
-                    background_true_color,
-                    background_transparency,
-                ) = background_data
-                rotation = math.degrees(math.atan2(x_axis_dir[1], x_axis_dir[0]))
-                plain_text = _decode_mtext_plain_text(text)
-                yield Entity(
-                    dxftype="MTEXT",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "text": plain_text,
-                            "raw_text": text,
-                            "insert": insertion,
-                            "extrusion": extrusion,
-                            "text_direction": x_axis_dir,
-                            "rotation": rotation,
-                            "rect_width": rect_width,
-                            "char_height": text_height,
-                            "attachment_point": attachment,
-                            "drawing_direction": drawing_dir,
-                            "background_flags": background_flags,
-                            "background_scale_factor": background_scale_factor,
-                            "background_color_index": background_color_index,
-                            "background_true_color": background_true_color,
-                            "background_transparency": background_transparency,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="MTEXT",
-                    ),
-                )
-            return
-
-        if dxftype == "LEADER":
-            for handle, annotation_type, path_type, points in raw.decode_leader_entities(
-                decode_path
-            ):
-                points_list = list(points)
-                yield Entity(
-                    dxftype="LEADER",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "annotation_type": int(annotation_type),
-                            "path_type": int(path_type),
-                            "points": points_list,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="LEADER",
-                    ),
-                )
-            return
-
-        if dxftype == "HATCH":
-            for (
+                {
+                    "scenario": scenario,
+                    "degree": degree,
+                    "rational": bool(rational),
+                    "closed": bool(closed),
+                    "periodic": bool(periodic),
+                    "fit_tolerance": fit_tolerance,
+                    "knot_tolerance": knot_tolerance,
+                    "ctrl_tolerance": ctrl_tolerance,
+                    "knots": list(knots),
+                    "control_points": list(control_points),
+                    "weights": list(weights),
+                    "fit_points": list(fit_points),
+                    "points": points,
+                },
+            ),
+        )
+
+
+def _iter_text(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        text,
+        insertion,
+        alignment,
+        extrusion,
+        metrics,
+        align_flags,
+        style_handle,
+    ) in ctx.rows("decode_text_entities"):
+        thickness, oblique_angle, height, rotation, width_factor = metrics
+        generation, horizontal_alignment, vertical_alignment = align_flags
+        yield Entity(
+            dxftype="TEXT",
+            handle=handle,
+            dxf=ctx.attach_color(
+                handle,
+                {
+                    "text": text,
+                    "insert": insertion,
+                    "align_point": alignment,
+                    "extrusion": extrusion,
+                    "thickness": thickness,
+                    "oblique": oblique_angle * _RAD2DEG,
+                    "height": height,
+                    "rotation": rotation * _RAD2DEG,
+                    "width": width_factor,
+                    "text_generation_flag": generation,
+                    "halign": horizontal_alignment,
+                    "valign": vertical_alignment,
+                    "style_handle": style_handle,
+                },
+            ),
+        )
+
+
+def _iter_attrib(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        text,
+        tag,
+        prompt,
+        insertion,
+        alignment,
+        extrusion,
+        metrics,
+        align_flags,
+        attrib_flags,
+        lock_position,
+        style_handle,
+    ) in ctx.rows("decode_attrib_entities"):
+        thickness, oblique_angle, height, rotation, width_factor = metrics
+        generation, horizontal_alignment, vertical_alignment = align_flags
+        yield Entity(
+            dxftype="ATTRIB",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                name,
-                solid_fill,
-                associative,
-                elevation,
-                extrusion,
-                path_rows,
-            ) in raw.decode_hatch_entities(decode_path):
-                paths = []
-                for closed, points in path_rows:
-                    path_points = [(x, y, elevation) for x, y in points]
-                    if bool(closed) and len(path_points) > 1 and path_points[0] != path_points[-1]:
-                        path_points.append(path_points[0])
-                    paths.append(
-                        {
-                            "closed": bool(closed),
-                            "points": path_points,
-                        }
-                    )
-                yield Entity(
-                    dxftype="HATCH",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "pattern_name": name,
-                            "solid_fill": bool(solid_fill),
-                            "associative": bool(associative),
-                            "elevation": elevation,
-                            "extrusion": extrusion,
-                            "paths": paths,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="HATCH",
-                    ),
-                )
-            return
-
-        if dxftype == "TOLERANCE":
-            for (
+                {
+                    "text": text,
+                    "tag": tag,
+                    "prompt": prompt,
+                    "insert": insertion,
+                    "align_point": alignment,
+                    "extrusion": extrusion,
+                    "thickness": thickness,
+                    "oblique": oblique_angle * _RAD2DEG,
+                    "height": height,
+                    "rotation": rotation * _RAD2DEG,
+                    "width": width_factor,
+                    "text_generation_flag": generation,
+                    "halign": horizontal_alignment,
+                    "valign": vertical_alignment,
+                    "style_handle": style_handle,
+                    "attribute_flags": int(attrib_flags),
+                    "lock_position": bool(lock_position),
+                },
+            ),
+        )
+
+
+def _iter_attdef(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        text,
+        tag,
+        prompt,
+        insertion,
+        alignment,
+        extrusion,
+        metrics,
+        align_flags,
+        attrib_flags,
+        lock_position,
+        style_handle,
+    ) in ctx.rows("decode_attdef_entities"):
+        thickness, oblique_angle, height, rotation, width_factor = metrics
+        generation, horizontal_alignment, vertical_alignment = align_flags
+        yield Entity(
+            dxftype="ATTDEF",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                text,
-                insertion,
-                x_direction,
-                extrusion,
-                height,
-                dimgap,
-                dimstyle_handle,
-            ) in raw.decode_tolerance_entities(decode_path):
-                rotation = math.degrees(math.atan2(x_direction[1], x_direction[0]))
-                yield Entity(
-                    dxftype="TOLERANCE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "text": text,
-                            "insert": insertion,
-                            "x_direction": x_direction,
-                            "extrusion": extrusion,
-                            "height": height,
-                            "dimgap": dimgap,
-                            "rotation": rotation,
-                            "dimstyle_handle": dimstyle_handle,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="TOLERANCE",
-                    ),
-                )
-            return
-
-        if dxftype == "MLINE":
-            for (
+                {
+                    "text": text,
+                    "tag": tag,
+                    "prompt": prompt,
+                    "insert": insertion,
+                    "align_point": alignment,
+                    "extrusion": extrusion,
+                    "thickness": thickness,
+                    "oblique": oblique_angle * _RAD2DEG,
+                    "height": height,
+                    "rotation": rotation * _RAD2DEG,
+                    "width": width_factor,
+                    "text_generation_flag": generation,
+                    "halign": horizontal_alignment,
+                    "valign": vertical_alignment,
+                    "style_handle": style_handle,
+                    "attribute_flags": int(attrib_flags),
+                    "lock_position": bool(lock_position),
+                },
+            ),
+        )
+
+
+def _iter_mtext(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        text,
+        insertion,
+        extrusion,
+        x_axis_dir,
+        rect_width,
+        text_height,
+        attachment,
+        drawing_dir,
+        background_data,
+    ) in ctx.rows("decode_mtext_entities"):
+        (
+            background_flags,
+            background_scale_factor,
+            background_color_index,
+            background_true_color,
+            background_transparency,
+        ) = background_data
+        rotation = math.atan2(x_axis_dir[1], x_axis_dir[0]) * _RAD2DEG
+        plain_text = _decode_mtext_plain_text(text)
+        yield Entity(
+            dxftype="MTEXT",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                scale,
-                justification,
-                base_point,
-                extrusion,
-                open_closed,
-                lines_in_style,
-                vertices,
-                mlinestyle_handle,
-            ) in raw.decode_mline_entities(decode_path):
-                vertices_list = list(vertices)
-                points = [vertex[0] for vertex in vertices_list if len(vertex) >= 1]
-                vertex_directions = [vertex[1] for vertex in vertices_list if len(vertex) >= 2]
-                miter_directions = [vertex[2] for vertex in vertices_list if len(vertex) >= 3]
-                flags = int(open_closed)
-                closed = flags == 3 or bool(flags & 0x02)
-                yield Entity(
-                    dxftype="MLINE",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "scale": scale,
-                            "justification": int(justification),
-                            "base_point": base_point,
-                            "extrusion": extrusion,
-                            "flags": flags,
-                            "closed": closed,
-                            "line_count": int(lines_in_style),
-                            "points": points,
-                            "vertex_directions": vertex_directions,
-                            "miter_directions": miter_directions,
-                            "mlinestyle_handle": mlinestyle_handle,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="MLINE",
-                    ),
-                )
-            return
-
-        if dxftype == "MINSERT":
-            for (
+                {
+                    "text": plain_text,
+                    "raw_text": text,
+                    "insert": insertion,
+                    "extrusion": extrusion,
+                    "text_direction": x_axis_dir,
+                    "rotation": rotation,
+                    "rect_width": rect_width,
+                    "char_height": text_height,
+                    "attachment_point": attachment,
+                    "drawing_direction": drawing_dir,
+                    "background_flags": background_flags,
+                    "background_scale_factor": background_scale_factor,
+                    "background_color_index": background_color_index,
+                    "background_true_color": background_true_color,
+                    "background_transparency": background_transparency,
+                },
+            ),
+        )
+
+
+def _iter_leader(ctx: _EntityContext) -> Iterator[Entity]:
+    for handle, annotation_type, path_type, points in ctx.rows(
+        "decode_leader_entities"
+    ):
+        points_list = list(points)
+        yield Entity(
+            dxftype="LEADER",
+            handle=handle,
+            dxf=ctx.attach_color(
                 handle,
-                px,
-                py,
-                pz,
-                sx,
-                sy,
-                sz,
-                rotation,
-                num_columns,
-                num_rows,
-                column_spacing,
-                row_spacing,
-            ) in raw.decode_minsert_entities(decode_path):
-                yield Entity(
-                    dxftype="MINSERT",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        {
-                            "insert": (px, py, pz),
-                            "xscale": sx,
-                            "yscale": sy,
-                            "zscale": sz,
-                            "rotation": math.degrees(rotation),
-                            "column_count": num_columns,
-                            "row_count": num_rows,
-                            "column_spacing": column_spacing,
-                            "row_spacing": row_spacing,
-                        },
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="MINSERT",
-                    ),
-                )
-            return
-
-        if dxftype == "DIMENSION":
-            dimension_rows: list[tuple[str, tuple]] = []
-            used_bulk_decoder = False
-
-            try:
-                for dimtype, row in raw.decode_dimension_entities(decode_path):
-                    dimension_rows.append((str(dimtype).upper(), row))
-                used_bulk_decoder = True
-            except Exception:
-                used_bulk_decoder = False
-
-            def _append_rows(dimtype: str, decode_fn) -> None:
-                try:
-                    rows = decode_fn(decode_path)
-                except Exception:
-                    rows = []
-                for row in rows:
-                    dimension_rows.append((dimtype, row))
-
-            if not used_bulk_decoder:
-                _append_rows("LINEAR", raw.decode_dim_linear_entities)
-                _append_rows("ORDINATE", raw.decode_dim_ordinate_entities)
-                _append_rows("ALIGNED", raw.decode_dim_aligned_entities)
-                _append_rows("ANG3PT", raw.decode_dim_ang3pt_entities)
-                _append_rows("ANG2LN", raw.decode_dim_ang2ln_entities)
-                _append_rows("RADIUS", raw.decode_dim_radius_entities)
-                _append_rows("DIAMETER", raw.decode_dim_diameter_entities)
-
-            dimension_rows.sort(key=lambda item: item[1][0])
-            for dimtype, row in dimension_rows:
-                (
-                    handle,
-                    user_text,
-                    point10,
-                    point13,
-                    point14,
-                    text_midpoint,
-                    insert_point,
-                    transforms,
-                    angles,
-                    common_data,
-                    handle_data,
-                ) = row
-                extrusion, insert_scale = transforms
-                text_rotation, horizontal_direction, ext_line_rotation, dim_rotation = angles
-                (
-                    dim_flags,
-                    actual_measurement,
-                    attachment_point,
-                    line_spacing_style,
-                    line_spacing_factor,
-                    insert_rotation,
-                ) = common_data
-                dimstyle_handle, anonymous_block_handle = handle_data
-                common_dxf = _build_dimension_common_dxf(
-                    user_text=user_text,
-                    text_midpoint=text_midpoint,
-                    insert_point=insert_point,
-                    extrusion=extrusion,
-                    insert_scale=insert_scale,
-                    text_rotation=text_rotation,
-                    horizontal_direction=horizontal_direction,
-                    dim_flags=dim_flags,
-                    actual_measurement=actual_measurement,
-                    attachment_point=attachment_point,
-                    line_spacing_style=line_spacing_style,
-                    line_spacing_factor=line_spacing_factor,
-                    insert_rotation=insert_rotation,
-                    dimstyle_handle=dimstyle_handle,
-                    anonymous_block_handle=anonymous_block_handle,
-                )
-                dim_dxf = {
-                    "dimtype": dimtype,
-                    "defpoint": point10,
-                    "defpoint2": point13,
-                    "defpoint3": point14,
-                    "oblique_angle": math.degrees(ext_line_rotation),
-                    "angle": math.degrees(dim_rotation),
+                {
+                    "annotation_type": int(annotation_type),
+                    "path_type": int(path_type),
+                    "points": points_list,
+                },
+            ),
+        )
+
+
+def _iter_hatch(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        name,
+        solid_fill,
+        associative,
+        elevation,
+        extrusion,
+        path_rows,
+    ) in ctx.rows("decode_hatch_entities"):
+        paths = []
+        for closed, points in path_rows:
+            path_points = [(x, y, elevation) for x, y in points]
+            if bool(closed) and len(path_points) > 1 and path_points[0] != path_points[-1]:
+                path_points.append(path_points[0])
+            paths.append(
+                {
+                    "closed": bool(closed),
+                    "points": path_points,
                 }
-                dim_dxf.update(common_dxf)
-                dim_dxf["common"] = dict(common_dxf)
-                yield Entity(
-                    dxftype="DIMENSION",
-                    handle=handle,
-                    dxf=_attach_entity_color(
-                        handle,
-                        dim_dxf,
-                        entity_style_map,
-                        layer_color_map,
-                        layer_color_overrides,
-                        dxftype="DIMENSION",
-                    ),
-                )
-            return
-
-        raise ValueError(
-            f"unsupported entity type: {dxftype}. "
-            "Supported types: LINE, LWPOLYLINE, POLYLINE_3D, POLYLINE_MESH, POLYLINE_PFACE, 3DFACE, SOLID, TRACE, SHAPE, ARC, CIRCLE, ELLIPSE, SPLINE, POINT, TEXT, ATTRIB, ATTDEF, MTEXT, LEADER, HATCH, TOLERANCE, MLINE, MINSERT, DIMENSION"
+            )
+        yield Entity(
+            dxftype="HATCH",
+            handle=handle,
+            dxf=ctx.attach_color(
+                handle,
+                {
+                    "pattern_name": name,
+                    "solid_fill": bool(solid_fill),
+                    "associative": bool(associative),
+                    "elevation": elevation,
+                    "extrusion": extrusion,
+                    "paths": paths,
+                },
+            ),
+        )
+
+
+def _iter_tolerance(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        text,
+        insertion,
+        x_direction,
+        extrusion,
+        height,
+        dimgap,
+        dimstyle_handle,
+    ) in ctx.rows("decode_tolerance_entities"):
+        rotation = math.atan2(x_direction[1], x_direction[0]) * _RAD2DEG
+        yield Entity(
+            dxftype="TOLERANCE",
+            handle=handle,
+            dxf=ctx.attach_color(
+                handle,
+                {
+                    "text": text,
+                    "insert": insertion,
+                    "x_direction": x_direction,
+                    "extrusion": extrusion,
+                    "height": height,
+                    "dimgap": dimgap,
+                    "rotation": rotation,
+                    "dimstyle_handle": dimstyle_handle,
+                },
+            ),
         )
 
 
+def _iter_mline(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        scale,
+        justification,
+        base_point,
+        extrusion,
+        open_closed,
+        lines_in_style,
+        vertices,
+        mlinestyle_handle,
+    ) in ctx.rows("decode_mline_entities"):
+        vertices_list = list(vertices)
+        points = [vertex[0] for vertex in vertices_list if len(vertex) >= 1]
+        vertex_directions = [vertex[1] for vertex in vertices_list if len(vertex) >= 2]
+        miter_directions = [vertex[2] for vertex in vertices_list if len(vertex) >= 3]
+        flags = int(open_closed)
+        closed = flags == 3 or bool(flags & 0x02)
+        yield Entity(
+            dxftype="MLINE",
+            handle=handle,
+            dxf=ctx.attach_color(
+                handle,
+                {
+                    "scale": scale,
+                    "justification": int(justification),
+                    "base_point": base_point,
+                    "extrusion": extrusion,
+                    "flags": flags,
+                    "closed": closed,
+                    "line_count": int(lines_in_style),
+                    "points": points,
+                    "vertex_directions": vertex_directions,
+                    "miter_directions": miter_directions,
+                    "mlinestyle_handle": mlinestyle_handle,
+                },
+            ),
+        )
+
+
+def _iter_minsert(ctx: _EntityContext) -> Iterator[Entity]:
+    for (
+        handle,
+        px,
+        py,
+        pz,
+        sx,
+        sy,
+        sz,
+        rotation,
+        num_columns,
+        num_rows,
+        column_spacing,
+        row_spacing,
+    ) in ctx.rows("decode_minsert_entities"):
+        yield Entity(
+            dxftype="MINSERT",
+            handle=handle,
+            dxf=ctx.attach_color(
+                handle,
+                {
+                    "insert": (px, py, pz),
+                    "xscale": sx,
+                    "yscale": sy,
+                    "zscale": sz,
+                    "rotation": rotation * _RAD2DEG,
+                    "column_count": num_columns,
+                    "row_count": num_rows,
+                    "column_spacing": column_spacing,
+                    "row_spacing": row_spacing,
+                },
+            ),
+        )
+
+
+def _iter_dimension(ctx: _EntityContext) -> Iterator[Entity]:
+    dimension_rows: Iterable[tuple[str, tuple]]
+    try:
+        bulk_dimension_rows = [
+            (str(dimtype).upper(), row)
+            for dimtype, row in ctx.rows("decode_dimension_entities")
+        ]
+    except Exception:
+        bulk_dimension_rows = None
+
+    if bulk_dimension_rows is not None:
+        bulk_dimension_rows.sort(key=_dimension_row_handle)
+        dimension_rows = bulk_dimension_rows
+    else:
+        dimension_rows = heapq.merge(
+            *(
+                _sorted_dimension_rows(dimtype, decoder_name, ctx)
+                for dimtype, decoder_name in _DIMENSION_DECODERS
+            ),
+            key=_dimension_row_handle,
+        )
+
+    for dimtype, row in dimension_rows:
+        (
+            handle,
+            user_text,
+            point10,
+            point13,
+            point14,
+            text_midpoint,
+            insert_point,
+            transforms,
+            angles,
+            common_data,
+            handle_data,
+        ) = row
+        extrusion, insert_scale = transforms
+        text_rotation, horizontal_direction, ext_line_rotation, dim_rotation = angles
+        (
+            dim_flags,
+            actual_measurement,
+            attachment_point,
+            line_spacing_style,
+            line_spacing_factor,
+            insert_rotation,
+        ) = common_data
+        dimstyle_handle, anonymous_block_handle = handle_data
+        common_dxf = _build_dimension_common_dxf(
+            user_text=user_text,
+            text_midpoint=text_midpoint,
+            insert_point=insert_point,
+            extrusion=extrusion,
+            insert_scale=insert_scale,
+            text_rotation=text_rotation,
+            horizontal_direction=horizontal_direction,
+            dim_flags=dim_flags,
+            actual_measurement=actual_measurement,
+            attachment_point=attachment_point,
+            line_spacing_style=line_spacing_style,
+            line_spacing_factor=line_spacing_factor,
+            insert_rotation=insert_rotation,
+            dimstyle_handle=dimstyle_handle,
+            anonymous_block_handle=anonymous_block_handle,
+        )
+        dim_dxf = {
+            "dimtype": dimtype,
+            "defpoint": point10,
+            "defpoint2": point13,
+            "defpoint3": point14,
+            "oblique_angle": ext_line_rotation * _RAD2DEG,
+            "angle": dim_rotation * _RAD2DEG,
+            **common_dxf,
+            "common": common_dxf,
+        }
+        yield Entity(
+            dxftype="DIMENSION",
+            handle=handle,
+            dxf=ctx.attach_color(
+                handle,
+                dim_dxf,
+            ),
+        )
+
+
+def _sorted_dimension_rows(
+    dimtype: str, decoder_name: str, ctx: _EntityContext
+) -> list[tuple[str, tuple]]:
+    try:
+        rows = ctx.rows(decoder_name)
+    except Exception:
+        rows = []
+    dimension_rows = [(dimtype, row) for row in rows]
+    dimension_rows.sort(key=_dimension_row_handle)
+    return dimension_rows
+
+
+def _dimension_row_handle(item: tuple[str, tuple]) -> int:
+    return item[1][0]
+
+
+_TYPE_DISPATCH = {
+    "LINE": _iter_line,
+    "ARC": _iter_arc,
+    "LWPOLYLINE": _iter_lwpolyline,
+    "POLYLINE_3D": _iter_polyline_3d,
+    "POLYLINE_MESH": _iter_polyline_mesh,
+    "POLYLINE_PFACE": _iter_polyline_pface,
+    "3DFACE": _iter_3dface,
+    "SOLID": _iter_solid,
+    "TRACE": _iter_trace,
+    "SHAPE": _iter_shape,
+    "POINT": _iter_point,
+    "CIRCLE": _iter_circle,
+    "ELLIPSE": _iter_ellipse,
+    "SPLINE": _iter_spline,
+    "TEXT": _iter_text,
+    "ATTRIB": _iter_attrib,
+    "ATTDEF": _iter_attdef,
+    "MTEXT": _iter_mtext,
+    "LEADER": _iter_leader,
+    "HATCH": _iter_hatch,
+    "TOLERANCE": _iter_tolerance,
+    "MLINE": _iter_mline,
+    "MINSERT": _iter_minsert,
+    "DIMENSION": _iter_dimension,
+}
+
+
+def _file_stamp(path: str) -> _FileStamp:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=64)
+def _detect_version(path: str, stamp: _FileStamp) -> str:
+    return raw.detect_version(path)
+
+
+@lru_cache(maxsize=1024)
 def _decode_mtext_plain_text(value: str) -> str:
     if not value:
         return ""
+    if "\\" not in value:
+        if "{" not in value and "}" not in value:
+            return value
+        return value.translate(_MTEXT_BRACE_STRIP)
+    return _MTEXT_TOKEN_RE.sub(_mtext_token_text, value)
 
-    out: list[str] = []
-    i = 0
-    n = len(value)
-    while i < n:
-        ch = value[i]
-
-        if ch in "{}":
-            i += 1
-            continue
-        if ch != "\\":
-            out.append(ch)
-            i += 1
-            continue
-        if i + 1 >= n:
-            out.append("\\")
-            break
-
-        code = value[i + 1]
-        if code in "\\{}":
-            out.append(code)
-            i += 2
-            continue
-        if code in {"P", "X"}:
-            out.append("\n")
-            i += 2
-            continue
-        if code == "~":
-            out.append(" ")
-            i += 2
-            continue
-        if code in {"L", "l", "O", "o", "K", "k"}:
-            i += 2
-            continue
-        if code in {"U", "u"} and i + 6 < n and value[i + 2] == "+":
-            hex_digits = value[i + 3 : i + 7]
-            if all(c in "0123456789abcdefABCDEF" for c in hex_digits):
-                out.append(chr(int(hex_digits, 16)))
-                i += 7
-                continue
-        if code == "S":
-            i += 2
-            stacked: list[str] = []
-            while i < n and value[i] != ";":
-                token = value[i]
-                if token in {"#", "^"}:
-                    token = "/"
-                stacked.append(token)
-                i += 1
-            if i < n and value[i] == ";":
-                i += 1
-            out.append("".join(stacked))
-            continue
-        if code in {"A", "C", "c", "F", "f", "H", "h", "Q", "q", "T", "t", "W", "w", "p"}:
-            i += 2
-            while i < n and value[i] != ";":
-                i += 1
-            if i < n and value[i] == ";":
-                i += 1
-            continue
-
-        out.append(code)
-        i += 2
 
-    return "".join(out)
+def _mtext_token_text(match: re.Match[str]) -> str:
+    group = match.lastindex
+    if group is None:
+        return ""
+    text = match.group(group)
+    if group == 1:
+        return chr(int(text, 16))
+    if group == 2:
+        return text.translate(_MTEXT_STACK_SEPARATORS)
+    return _MTEXT_ESCAPES.get(text, text)
 
 
 def _build_dimension_common_dxf(
@@ -1102,27 +1085,29 @@ def _build_dimension_common_dxf(
         "extrusion": extrusion,
         "insert_scale": insert_scale,
         "text": user_text,
-        "text_rotation": math.degrees(text_rotation),
-        "horizontal_direction": math.degrees(horizontal_direction),
+        "text_rotation": text_rotation * _RAD2DEG,
+        "horizontal_direction": horizontal_direction * _RAD2DEG,
         "dim_flags": dim_flags,
         "actual_measurement": actual_measurement,
         "attachment_point": attachment_point,
         "line_spacing_style": line_spacing_style,
         "line_spacing_factor": line_spacing_factor,
-        "insert_rotation": math.degrees(insert_rotation),
+        "insert_rotation": insert_rotation * _RAD2DEG,
         "dimstyle_handle": dimstyle_handle,
         "anonymous_block_handle": anonymous_block_handle,
     }
 
 
 @lru_cache(maxsize=16)
-def _present_supported_types(path: str | None) -> tuple[str, ...]:
+def _present_supported_types(
+    path: str | None, stamp: _FileStamp = None
+) -> tuple[str, ...]:
     if not path:
-        return tuple(SUPPORTED_ENTITY_TYPES)
+        return SUPPORTED_ENTITY_TYPES
     try:
         headers = raw.list_object_headers_with_type(path)
     except Exception:
-        return tuple(SUPPORTED_ENTITY_TYPES)
+        return SUPPORTED_ENTITY_TYPES
 
     seen: set[str] = set()
     for row in headers:
@@ -1133,7 +1118,7 @@ def _present_supported_types(path: str | None) -> tuple[str, ...]:
             seen.add(canonical)
 
     if not seen:
-        return tuple(SUPPORTED_ENTITY_TYPES)
+        return SUPPORTED_ENTITY_TYPES
     return tuple(dxftype for dxftype in SUPPORTED_ENTITY_TYPES if dxftype in seen)
 
 
@@ -1144,37 +1129,62 @@ def _canonical_entity_type_name(raw_name: object) -> str | None:
     if name.startswith("DIM_"):
         return "DIMENSION"
     canonical = TYPE_ALIASES.get(name, name)
-    if canonical in SUPPORTED_ENTITY_TYPES:
+    if canonical in _SUPPORTED_ENTITY_TYPE_SET:
         return canonical
     return None
 
 
-def _normalize_types(types: str | Iterable[str] | None, path: str | None = None) -> list[str]:
-    default_types = list(_present_supported_types(path))
+def _normalize_types(
+    types: str | Iterable[str] | None,
+    path: str | None = None,
+    stamp: _FileStamp = None,
+) -> tuple[str, ...]:
+    default_types = _present_supported_types(path, stamp)
     if types is None:
         return default_types
     if isinstance(types, str):
-        tokens = re.split(r"[,\s]+", types.strip())
+        token = types.strip().upper()
+        token = TYPE_ALIASES.get(token, token)
+        if token in _SUPPORTED_ENTITY_TYPE_SET:
+            return (token,)
+        return _select_types(types, default_types)
+    return _select_types(tuple(types), default_types)
+
+
+@lru_cache(maxsize=64)
+def _select_types(
+    types: str | tuple[str, ...], default_types: tuple[str, ...]
+) -> tuple[str, ...]:
+    if isinstance(types, str):
+        tokens = _TYPE_SPLIT_RE.split(types.strip())
     else:
-        tokens = list(types)
-
-    normalized = [token.strip().upper() for token in tokens if token and token.strip()]
-    normalized = [TYPE_ALIASES.get(token, token) for token in normalized]
+        tokens = types
+
+    alias = TYPE_ALIASES.get
+    normalized = [
+        alias(token, token)
+        for token in (raw_token.strip().upper() for raw_token in tokens if raw_token)
+        if token
+    ]
     if not normalized:
         return default_types
 
-    if any(token in {"*", "ALL"} for token in normalized):
+    if not _ALL_TYPE_TOKENS.isdisjoint(normalized):
         return default_types
 
+    if not any(map(_HAS_GLOB, normalized)):
+        return tuple(
+            dict.fromkeys(
+                token for token in normalized if token in _SUPPORTED_ENTITY_TYPE_SET
+            )
+        )
+
     selected: list[str] = []
     seen = set()
-    candidate_types = default_types if path is not None else list(SUPPORTED_ENTITY_TYPES)
 
     for token in normalized:
-        if any(ch in token for ch in "*?[]"):
-            matches = [
-                name for name in candidate_types if fnmatch.fnmatchcase(name, token)
-            ]
+        if _HAS_GLOB(token):
+            matches = [name for name in _glob_matches(token) if name in default_types]
             if not matches:
                 continue
             for name in matches:
@@ -1183,34 +1193,56 @@ def _normalize_types(types: str | Iterable[str] | None, path: str | None = None)
                     selected.append(name)
             continue
 
-        if token in SUPPORTED_ENTITY_TYPES:
+        if token in _SUPPORTED_ENTITY_TYPE_SET:
             if token not in seen:
                 seen.add(token)
                 selected.append(token)
 
-    return selected
+    return tuple(selected)
 
 
-@lru_cache(maxsize=16)
-def _line_arc_circle_rows(
-    path: str,
-) -> tuple[
-    list[tuple[int, float, float, float, float, float, float]],
-    list[tuple[int, float, float, float, float, float, float]],
-    list[tuple[int, float, float, float, float]],
-]:
+@lru_cache(maxsize=128)
+def _glob_matches(token: str) -> tuple[str, ...]:
+    match = re.compile(fnmatch.translate(token)).match
+    return tuple(name for name in SUPPORTED_ENTITY_TYPES if match(name))
+
+
+def _decoded_rows(decoder_name: str, path: str, stamp: _FileStamp) -> tuple:
+    key = (decoder_name, path, stamp)
+    rows = _DECODED_ROWS.get(key)
+    if rows is None:
+        rows = tuple(getattr(raw, decoder_name)(path))
+        _store_decoded_rows(key, rows)
+    else:
+        _DECODED_ROWS.move_to_end(key)
+    return rows
+
+
+def _store_decoded_rows(key: tuple[str, str, _FileStamp], rows: tuple) -> None:
+    _DECODED_ROWS[key] = rows
+    _DECODED_ROWS.move_to_end(key)
+    while len(_DECODED_ROWS) > _DECODED_ROWS_MAXSIZE:
+        _DECODED_ROWS.popitem(last=False)
+
+
+def _prefetch_line_arc_circle_rows(
+    path: str, stamp: _FileStamp, types: tuple[str, ...]
+) -> None:
+    missing = [
+        decoder_name
+        for dxftype, decoder_name in _BULK_PRIMITIVE_DECODERS
+        if dxftype in types and (decoder_name, path, stamp) not in _DECODED_ROWS
+    ]
+    if len(missing) < 2:
+        return
     try:
-        line_rows, arc_rows, circle_rows = raw.decode_line_arc_circle_entities(path)
-        return list(line_rows), list(arc_rows), list(circle_rows)
+        bulk_rows = raw.decode_line_arc_circle_entities(path)
     except Exception:
-        return (
-            list(raw.decode_line_entities(path)),
-            list(raw.decode_arc_entities(path)),
-            list(raw.decode_circle_entities(path)),
-        )
+        return
+    for (_, decoder_name), rows in zip(_BULK_PRIMITIVE_DECODERS, bulk_rows):
+        _store_decoded_rows((decoder_name, path, stamp), tuple(rows))
 
 
-@lru_cache(maxsize=16)
 def _entity_style_map(path: str) -> dict[int, tuple[int | None, int | None, int]]:
     try:
         return {
@@ -1221,7 +1253,6 @@ def _entity_style_map(path: str) -> dict[int, tuple[int | None, int | None, int]
         return {}
 
 
-@lru_cache(maxsize=16)
 def _layer_color_map(path: str) -> dict[int, tuple[int, int | None]]:
     try:
         return {
@@ -1232,6 +1263,22 @@ def _layer_color_map(path: str) -> dict[int, tuple[int, int | None]]:
         return {}
 
 
+@lru_cache(maxsize=64)
+def _color_context(
+    path: str, version: str, stamp: _FileStamp
+) -> tuple[
+    dict[int, tuple[int | None, int | None, int]],
+    dict[int, tuple[int, int | None]],
+    dict[int, tuple[int, int | None]],
+]:
+    entity_style_map = _entity_style_map(path)
+    layer_color_map = _layer_color_map(path)
+    layer_color_overrides = _layer_color_overrides(
+        version, entity_style_map, layer_color_map
+    )
+    return entity_style_map, layer_color_map, layer_color_overrides
+
+
 def _layer_color_overrides(
     version: str,
     entity_style_map: dict[int, tuple[int | None, int | None, int]],
@@ -1240,35 +1287,32 @@ def _layer_color_overrides(
     if version not in {"AC1024", "AC1027", "AC1032"}:
         return {}
 
-    usage: dict[int, int] = {}
-    for _, _, layer_handle in entity_style_map.values():
-        usage[layer_handle] = usage.get(layer_handle, 0) + 1
-    if not usage:
+    total_usage = len(entity_style_map)
+    if total_usage < 40:
         return {}
 
-    resolved_layer_colors: dict[int, int] = {}
+    gray_layers: list[int] = []
+    blue_layers: list[int] = []
+    default_layer: int | None = None
     for handle, (index, true_color) in layer_color_map.items():
         resolved_index, _ = _normalize_resolved_color(index, true_color)
-        if resolved_index is not None:
-            resolved_layer_colors[handle] = resolved_index
-
-    gray_layers = [handle for handle, color in resolved_layer_colors.items() if color == 9]
-    blue_layers = [handle for handle, color in resolved_layer_colors.items() if color == 5]
-    default_layers = [handle for handle, color in resolved_layer_colors.items() if color == 7]
-    if not gray_layers or not blue_layers or not default_layers:
+        if resolved_index == 9:
+            gray_layers.append(handle)
+        elif resolved_index == 5:
+            blue_layers.append(handle)
+        elif resolved_index == 7 and (default_layer is None or handle < default_layer):
+            default_layer = handle
+    if not gray_layers or not blue_layers or default_layer is None:
         return {}
 
-    dominant_gray = max(gray_layers, key=lambda handle: usage.get(handle, 0))
-    missing_blue = min(blue_layers, key=lambda handle: usage.get(handle, 0))
-    default_layer = min(default_layers)
+    usage = Counter(map(itemgetter(2), entity_style_map.values()))
+    dominant_gray = max(gray_layers, key=usage.__getitem__)
+    missing_blue = min(blue_layers, key=usage.__getitem__)
 
-    dominant_usage = usage.get(dominant_gray, 0)
-    missing_blue_usage = usage.get(missing_blue, 0)
-    default_usage = usage.get(default_layer, 0)
-    total_usage = sum(usage.values())
+    dominant_usage = usage[dominant_gray]
+    missing_blue_usage = usage[missing_blue]
+    default_usage = usage[default_layer]
 
-    if total_usage < 40:
-        return {}
     if dominant_usage < max(16, total_usage // 3):
         return {}
     if missing_blue_usage != 0:
@@ -1290,138 +1334,145 @@ def _attach_entity_color(
     layer_color_overrides: dict[int, tuple[int, int | None]] | None = None,
     dxftype: str | None = None,
 ) -> dict:
-    index = None
-    true_color = None
-    layer_handle = None
-    resolved_index = None
-    resolved_true_color = None
-
-    style = entity_style_map.get(handle)
-    if style is not None:
-        index, true_color, layer_handle = style
-        resolved_index = index
-        resolved_true_color = true_color
-        if index in (None, 0, 256, 257) and true_color is None:
-            layer_style = None
-            if layer_color_overrides is not None:
-                layer_style = layer_color_overrides.get(layer_handle)
-            if layer_style is None:
-                layer_style = layer_color_map.get(layer_handle)
-            if layer_style is not None:
-                resolved_index, resolved_true_color = layer_style
-
-    if (
-        layer_color_overrides is not None
-        and dxftype == "ARC"
-    ):
-        source_layer = _override_source_layer(layer_color_overrides, 5)
-        gray_layer = _override_source_layer(layer_color_overrides, 9)
+    attach = _entity_color_attacher(
+        entity_style_map, layer_color_map, layer_color_overrides, dxftype
+    )
+    return attach(handle, dxf)
+
+
+def _entity_color_attacher(
+    entity_style_map: dict[int, tuple[int | None, int | None, int]],
+    layer_color_map: dict[int, tuple[int, int | None]],
+    layer_color_overrides: dict[int, tuple[int, int | None]] | None = None,
+    dxftype: str | None = None,
+) -> Callable[[int, dict], dict]:
+    style_get = entity_style_map.get
+    layer_get = layer_color_map.get
+    override_get = layer_color_overrides.get if layer_color_overrides else None
+    arc_gray_layer = arc_source_color = None
+    if override_get is not None and dxftype == "ARC":
+        override_index = _build_override_index(layer_color_overrides)
+        source_layer = override_index.get(5)
+        if source_layer is not None and 9 in override_index:
+            arc_gray_layer = override_index[9]
+            arc_source_color = layer_color_overrides[source_layer]
+
+    color_fields_by_style: dict[tuple | None, dict] = {}
+
+    def resolve(style: tuple[int | None, int | None, int] | None) -> dict:
+        if style is None:
+            index = true_color = layer_handle = None
+            resolved_index = resolved_true_color = None
+        else:
+            index, true_color, layer_handle = style
+            resolved_index = index
+            resolved_true_color = true_color
+            if true_color is None and index in _BYLAYER_INDICES:
+                layer_style = None
+                if override_get is not None:
+                    layer_style = override_get(layer_handle)
+                if layer_style is None:
+                    layer_style = layer_get(layer_handle)
+                if layer_style is not None:
+                    resolved_index, resolved_true_color = layer_style
+            if arc_source_color is not None and layer_handle == arc_gray_layer:
+                resolved_index, resolved_true_color = arc_source_color
+
         if (
-            source_layer is not None
-            and gray_layer is not None
-            and layer_handle == gray_layer
-            and source_layer in layer_color_overrides
+            resolved_true_color is not None
+            and 1 <= resolved_true_color <= 257
+            and resolved_index in _BYLAYER_INDICES
         ):
-            resolved_index, resolved_true_color = layer_color_overrides[source_layer]
+            resolved_index, resolved_true_color = resolved_true_color, None
+
+        color_fields = {
+            "color_index": index,
+            "true_color": true_color,
+            "layer_handle": layer_handle,
+            "resolved_color_index": resolved_index,
+            "resolved_true_color": resolved_true_color,
+        }
+        color_fields_by_style[style] = color_fields
+        return color_fields
 
-    resolved_index, resolved_true_color = _normalize_resolved_color(
-        resolved_index, resolved_true_color
-    )
+    def attach(handle: int, dxf: dict) -> dict:
+        style = style_get(handle)
+        color_fields = color_fields_by_style.get(style)
+        if color_fields is None:
+            color_fields = resolve(style)
+        dxf.update(color_fields)
+        return dxf
 
-    dxf["color_index"] = index
-    dxf["true_color"] = true_color
-    dxf["layer_handle"] = layer_handle
-    dxf["resolved_color_index"] = resolved_index
-    dxf["resolved_true_color"] = resolved_true_color
-    return dxf
+    return attach
 
 
 def _line_supplementary_handles(
     line_rows: list[tuple[int, float, float, float, float, float, float]],
     entity_style_map: dict[int, tuple[int | None, int | None, int]],
     layer_color_overrides: dict[int, tuple[int, int | None]] | None,
-) -> set[int]:
+) -> frozenset[int] | set[int]:
     if layer_color_overrides is None:
-        return set()
-    source_layer = _override_source_layer(layer_color_overrides, 5)
+        return _EMPTY_HANDLES
+    source_layer = _build_override_index(layer_color_overrides).get(5)
     if source_layer is None:
-        return set()
-
-    def _key(x: float, y: float, z: float) -> tuple[float, float, float]:
-        return (round(x, 6), round(y, 6), round(z, 6))
-
-    endpoint_usage: dict[tuple[float, float, float], int] = {}
-    for handle, sx, sy, sz, ex, ey, ez in line_rows:
-        style = entity_style_map.get(handle)
-        if style is None or style[2] != source_layer:
-            continue
-        ks = _key(sx, sy, sz)
-        ke = _key(ex, ey, ez)
-        endpoint_usage[ks] = endpoint_usage.get(ks, 0) + 1
-        endpoint_usage[ke] = endpoint_usage.get(ke, 0) + 1
-
-    candidate_lengths: list[float] = []
-    for handle, sx, sy, sz, ex, ey, ez in line_rows:
-        style = entity_style_map.get(handle)
-        if style is None or style[2] != source_layer:
-            continue
-        ks = _key(sx, sy, sz)
-        ke = _key(ex, ey, ez)
-        if endpoint_usage.get(ks, 0) != 1 or endpoint_usage.get(ke, 0) != 1:
-            continue
-        if abs(ex - sx) > 1e-9 and abs(ey - sy) > 1e-9:
-            continue
-        candidate_lengths.append(math.hypot(ex - sx, ey - sy))
-    if not candidate_lengths:
-        return set()
-    threshold = _percentile(candidate_lengths, 0.75)
+        return _EMPTY_HANDLES
 
-    result: set[int] = set()
+    style_get = entity_style_map.get
+    filtered: list[tuple[int, tuple, tuple, float | None]] = []
+    endpoint_usage: defaultdict[tuple[int, int, int], int] = defaultdict(int)
     for handle, sx, sy, sz, ex, ey, ez in line_rows:
-        style = entity_style_map.get(handle)
+        style = style_get(handle)
         if style is None or style[2] != source_layer:
             continue
-        ks = _key(sx, sy, sz)
-        ke = _key(ex, ey, ez)
-        if endpoint_usage.get(ks, 0) != 1 or endpoint_usage.get(ke, 0) != 1:
+        ks = _point_key(sx, sy, sz)
+        ke = _point_key(ex, ey, ez)
+        endpoint_usage[ks] += 1
+        endpoint_usage[ke] += 1
+        dx = ex - sx
+        dy = ey - sy
+        length = math.hypot(dx, dy) if abs(dx) <= 1e-9 or abs(dy) <= 1e-9 else None
+        filtered.append((handle, ks, ke, length))
+
+    candidates: list[tuple[int, float]] = []
+    for handle, ks, ke, length in filtered:
+        if length is None:
             continue
-        if abs(ex - sx) > 1e-9 and abs(ey - sy) > 1e-9:
+        if endpoint_usage[ks] != 1 or endpoint_usage[ke] != 1:
             continue
-        length = math.hypot(ex - sx, ey - sy)
-        if length + 1e-9 >= threshold:
-            result.add(handle)
-    return result
+        candidates.append((handle, length))
+    if not candidates:
+        return _EMPTY_HANDLES
+    threshold = _percentile([length for _, length in candidates], 0.75)
+    return {handle for handle, length in candidates if length + 1e-9 >= threshold}
 
 
 def _circle_supplementary_handles(
     circle_rows: list[tuple[int, float, float, float, float]],
     entity_style_map: dict[int, tuple[int | None, int | None, int]],
     layer_color_overrides: dict[int, tuple[int, int | None]] | None,
-) -> set[int]:
+) -> frozenset[int] | set[int]:
     if layer_color_overrides is None:
-        return set()
-    source_layer = _override_source_layer(layer_color_overrides, 5)
+        return _EMPTY_HANDLES
+    source_layer = _build_override_index(layer_color_overrides).get(5)
     if source_layer is None:
-        return set()
+        return _EMPTY_HANDLES
 
-    def _center_key(x: float, y: float, z: float) -> tuple[float, float, float]:
-        return (round(x, 6), round(y, 6), round(z, 6))
-
-    by_center: dict[tuple[float, float, float], list[tuple[int, float]]] = {}
+    style_get = entity_style_map.get
+    by_center: defaultdict[tuple[int, int, int], list[tuple[int, float]]] = defaultdict(list)
     for handle, cx, cy, cz, radius in circle_rows:
-        style = entity_style_map.get(handle)
+        style = style_get(handle)
         if style is None or style[2] != source_layer:
             continue
-        key = _center_key(cx, cy, cz)
-        by_center.setdefault(key, []).append((handle, radius))
+        key = _point_key(cx, cy, cz)
+        by_center[key].append((handle, radius))
 
     result: set[int] = set()
     for rows in by_center.values():
         if len(rows) < 2:
             continue
-        sorted_rows = sorted(rows, key=lambda row: row[1], reverse=True)
-        largest_handle, largest_radius = sorted_rows[0]
-        second_radius = sorted_rows[1][1]
+        (largest_handle, largest_radius), (_, second_radius) = heapq.nlargest(
+            2, rows, key=itemgetter(1)
+        )
         if second_radius <= 0:
             continue
         ratio = largest_radius / second_radius
@@ -1430,35 +1481,46 @@ def _circle_supplementary_handles(
     return result
 
 
-def _override_source_layer(
+def _point_key(x: float, y: float, z: float) -> tuple[int, int, int]:
+    return (round(x * 1e6), round(y * 1e6), round(z * 1e6))
+
+
+def _build_override_index(
     layer_color_overrides: dict[int, tuple[int, int | None]],
-    target_index: int,
-) -> int | None:
+) -> dict[int, int]:
+    override_index: dict[int, int] = {}
     for handle, (index, _) in layer_color_overrides.items():
-        if index == target_index:
-            return handle
-    return None
+        override_index.setdefault(index, handle)
+    return override_index
 
 
 def _percentile(values: list[float], p: float) -> float:
     if not values:
         return 0.0
-    sorted_values = sorted(values)
-    if len(sorted_values) == 1:
-        return sorted_values[0]
-    pos = p * (len(sorted_values) - 1)
+    count = len(values)
+    if count == 1:
+        return values[0]
+    pos = p * (count - 1)
     lower = int(math.floor(pos))
     upper = int(math.ceil(pos))
+    if lower * 2 >= count:
+        top = heapq.nlargest(count - lower, values)
+        lower_value = top[-1]
+        upper_value = top[-2] if upper != lower else lower_value
+    else:
+        bottom = heapq.nsmallest(upper + 1, values)
+        lower_value = bottom[lower]
+        upper_value = bottom[upper]
     if lower == upper:
-        return sorted_values[lower]
+        return lower_value
     weight = pos - lower
-    return sorted_values[lower] * (1.0 - weight) + sorted_values[upper] * weight
+    return lower_value * (1.0 - weight) + upper_value * weight
 
 
 def _normalize_resolved_color(
     index: int | None, true_color: int | None
 ) -> tuple[int | None, int | None]:
     if true_color is not None and 1 <= true_color <= 257:
-        if index in (None, 0, 256, 257):
+        if index in _BYLAYER_INDICES:
             return true_color, None
     return index, true_color
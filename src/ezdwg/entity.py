@@ -1,33 +1,59 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable
 
 Point3D = tuple[float, float, float]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Entity:
     dxftype: str
     handle: int
     dxf: dict[str, Any]
 
     def to_points(self) -> list[Point3D]:
-        if self.dxftype == "LINE":
-            return [self.dxf["start"], self.dxf["end"]]
-        if self.dxftype == "LWPOLYLINE":
-            return list(self.dxf.get("points", []))
-        if self.dxftype == "POINT":
-            return [self.dxf["location"]]
-        if self.dxftype in {"TEXT", "MTEXT"}:
-            return [self.dxf["insert"]]
-        if self.dxftype == "DIMENSION":
-            points = []
-            if "defpoint2" in self.dxf:
-                points.append(self.dxf["defpoint2"])
-            if "defpoint3" in self.dxf:
-                points.append(self.dxf["defpoint3"])
-            if points:
-                return points
-            return [self.dxf["text_midpoint"]]
-        raise NotImplementedError(f"to_points is not supported for {self.dxftype}")
+        try:
+            points_for = _TO_POINTS_DISPATCH[self.dxftype]
+        except KeyError:
+            raise NotImplementedError(
+                f"to_points is not supported for {self.dxftype}"
+            ) from None
+        return points_for(self.dxf)
+
+
+def _line_points(dxf: dict[str, Any]) -> list[Point3D]:
+    return [dxf["start"], dxf["end"]]
+
+
+def _lwpolyline_points(dxf: dict[str, Any]) -> list[Point3D]:
+    return list(dxf.get("points", []))
+
+
+def _point_points(dxf: dict[str, Any]) -> list[Point3D]:
+    return [dxf["location"]]
+
+
+def _insert_points(dxf: dict[str, Any]) -> list[Point3D]:
+    return [dxf["insert"]]
+
+
+def _dimension_points(dxf: dict[str, Any]) -> list[Point3D]:
+    points = []
+    if "defpoint2" in dxf:
+        points.append(dxf["defpoint2"])
+    if "defpoint3" in dxf:
+        points.append(dxf["defpoint3"])
+    if points:
+        return points
+    return [dxf["text_midpoint"]]
+
+
+_TO_POINTS_DISPATCH: dict[str, Callable[[dict[str, Any]], list[Point3D]]] = {
+    "LINE": _line_points,
+    "LWPOLYLINE": _lwpolyline_points,
+    "POINT": _point_points,
+    "TEXT": _insert_points,
+    "MTEXT": _insert_points,
+    "DIMENSION": _dimension_points,
+}
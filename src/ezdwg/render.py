@@ -1,6 +1,16 @@
 from __future__ import annotations
 
-from typing import Iterable, Any
+import math
+from functools import lru_cache
+from typing import Any, Callable, Iterable, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_MISSING = object()
+_PYPLOT = None
 
 
 def plot(
@@ -49,198 +59,22 @@ def plot_layout(
     if ax is None:
         _, ax = plt.subplots()
 
+    options = _PlotOptions(line_width, arc_segments, dimension_color)
+    batch = _LineBatch(ax)
     for entity in layout.query(types):
+        handler = _PLOT_DISPATCH.get(entity.dxftype)
+        if handler is None:
+            continue
         color = _resolve_dwg_color(entity.dxf)
         if color is None:
             color = "#000000"
-        dxftype = entity.dxftype
-        if dxftype == "LINE":
-            _draw_line(ax, entity.dxf["start"], entity.dxf["end"], line_width, color=color)
-        elif dxftype == "POINT":
-            _draw_point(ax, entity.dxf["location"], line_width, color=color)
-        elif dxftype == "LWPOLYLINE":
-            _draw_polyline(
-                ax,
-                entity.dxf.get("points", []),
-                line_width,
-                color=color,
-                bulges=entity.dxf.get("bulges"),
-                closed=bool(entity.dxf.get("closed", False)),
-                arc_segments=arc_segments,
-            )
-        elif dxftype == "POLYLINE_3D":
-            _draw_polyline(
-                ax,
-                entity.dxf.get("points", []),
-                line_width,
-                color=color,
-                closed=bool(entity.dxf.get("closed", False)),
-                arc_segments=arc_segments,
-            )
-        elif dxftype == "POLYLINE_MESH":
-            _draw_polyline_mesh(
-                ax,
-                entity.dxf.get("points", []),
-                entity.dxf.get("m_vertex_count", 0),
-                entity.dxf.get("n_vertex_count", 0),
-                bool(entity.dxf.get("closed", False)),
-                line_width,
-                color=color,
-                arc_segments=arc_segments,
-            )
-        elif dxftype == "POLYLINE_PFACE":
-            _draw_polyline_pface(
-                ax,
-                entity.dxf.get("vertices", []),
-                entity.dxf.get("faces", []),
-                line_width,
-                color=color,
-                arc_segments=arc_segments,
-            )
-        elif dxftype == "3DFACE":
-            _draw_3dface(
-                ax,
-                entity.dxf.get("points", []),
-                int(entity.dxf.get("invisible_edge_flags", 0)),
-                line_width,
-                color=color,
-            )
-        elif dxftype == "SOLID" or dxftype == "TRACE":
-            _draw_polyline(
-                ax,
-                entity.dxf.get("points", []),
-                line_width,
-                color=color,
-                closed=True,
-                arc_segments=arc_segments,
-            )
-        elif dxftype == "SHAPE":
-            _draw_point(ax, entity.dxf.get("insert", (0.0, 0.0, 0.0)), line_width, color=color)
-        elif dxftype == "ARC":
-            _draw_arc(
-                ax,
-                entity.dxf["center"],
-                entity.dxf["radius"],
-                entity.dxf["start_angle"],
-                entity.dxf["end_angle"],
-                arc_segments,
-                line_width,
-                color=color,
-            )
-        elif dxftype == "CIRCLE":
-            _draw_circle(
-                ax,
-                entity.dxf["center"],
-                entity.dxf["radius"],
-                arc_segments,
-                line_width,
-                color=color,
-            )
-        elif dxftype == "ELLIPSE":
-            _draw_ellipse(
-                ax,
-                entity.dxf["center"],
-                entity.dxf["major_axis"],
-                entity.dxf["axis_ratio"],
-                entity.dxf["start_angle"],
-                entity.dxf["end_angle"],
-                arc_segments,
-                line_width,
-                color=color,
-            )
-        elif dxftype == "SPLINE":
-            _draw_polyline(
-                ax,
-                entity.dxf.get("points", []),
-                line_width,
-                color=color,
-                closed=bool(entity.dxf.get("closed", False)),
-                arc_segments=arc_segments,
-            )
-        elif dxftype == "TEXT":
-            _draw_text(
-                ax,
-                entity.dxf.get("insert", (0.0, 0.0, 0.0)),
-                entity.dxf.get("text", ""),
-                entity.dxf.get("height", 1.0),
-                entity.dxf.get("rotation", 0.0),
-                color=color,
-            )
-        elif dxftype == "ATTRIB" or dxftype == "ATTDEF":
-            _draw_text(
-                ax,
-                entity.dxf.get("insert", (0.0, 0.0, 0.0)),
-                entity.dxf.get("text", ""),
-                entity.dxf.get("height", 1.0),
-                entity.dxf.get("rotation", 0.0),
-                color=color,
-            )
-        elif dxftype == "MTEXT":
-            _draw_text(
-                ax,
-                entity.dxf.get("insert", (0.0, 0.0, 0.0)),
-                entity.dxf.get("text", ""),
-                entity.dxf.get("char_height", 1.0),
-                entity.dxf.get("rotation", 0.0),
-                color=color,
-                background=_resolve_mtext_background_bbox(ax, entity.dxf),
-            )
-        elif dxftype == "LEADER":
-            _draw_polyline(
-                ax,
-                entity.dxf.get("points", []),
-                line_width,
-                color=color,
-                closed=False,
-                arc_segments=arc_segments,
-            )
-        elif dxftype == "HATCH":
-            for path in entity.dxf.get("paths", []):
-                points = path.get("points", []) if isinstance(path, dict) else []
-                closed = bool(path.get("closed", False)) if isinstance(path, dict) else False
-                _draw_polyline(
-                    ax,
-                    points,
-                    line_width,
-                    color=color,
-                    closed=closed,
-                    arc_segments=arc_segments,
-                )
-        elif dxftype == "TOLERANCE":
-            text_height = entity.dxf.get("height", 1.0)
-            try:
-                text_height = float(text_height)
-            except Exception:
-                text_height = 1.0
-            if text_height <= 0.0:
-                text_height = 1.0
-            _draw_text(
-                ax,
-                entity.dxf.get("insert", (0.0, 0.0, 0.0)),
-                entity.dxf.get("text", ""),
-                text_height,
-                entity.dxf.get("rotation", 0.0),
-                color=color,
-            )
-        elif dxftype == "MLINE":
-            _draw_polyline(
-                ax,
-                entity.dxf.get("points", []),
-                line_width,
-                color=color,
-                closed=bool(entity.dxf.get("closed", False)),
-                arc_segments=arc_segments,
-            )
-        elif dxftype == "MINSERT":
-            _draw_point(ax, entity.dxf.get("insert", (0.0, 0.0, 0.0)), line_width, color=color)
-        elif dxftype == "DIMENSION":
-            dim_color = color if dimension_color is None else dimension_color
-            _draw_dimension(ax, entity.dxf, line_width, color=dim_color)
+        handler(batch, entity.dxf, color, options)
+    batch.flush()
 
     if title:
         ax.set_title(title)
     if auto_fit:
-        _apply_auto_limits(ax, equal=equal, margin=fit_margin)
+        _apply_auto_limits(ax, batch.drawn, equal=equal, margin=fit_margin)
     else:
         ax.autoscale(True)
         if equal:
@@ -251,15 +85,319 @@ def plot_layout(
     return ax
 
 
-def _require_matplotlib():
+class _PlotOptions(NamedTuple):
+    line_width: float
+    arc_segments: int
+    dimension_color: Any | None
+
+
+def _plot_line(ax, dxf, color, options: _PlotOptions):
+    _draw_line(ax, dxf["start"], dxf["end"], options.line_width, color=color)
+
+
+def _plot_point(ax, dxf, color, options: _PlotOptions):
+    _draw_point(ax, dxf["location"], options.line_width, color=color)
+
+
+def _plot_insert_point(ax, dxf, color, options: _PlotOptions):
+    _draw_point(ax, dxf.get("insert", (0.0, 0.0, 0.0)), options.line_width, color=color)
+
+
+def _plot_lwpolyline(ax, dxf, color, options: _PlotOptions):
+    _draw_polyline(
+        ax,
+        dxf.get("points", []),
+        options.line_width,
+        color=color,
+        bulges=dxf.get("bulges"),
+        closed=bool(dxf.get("closed", False)),
+        arc_segments=options.arc_segments,
+    )
+
+
+def _plot_polyline(ax, dxf, color, options: _PlotOptions):
+    _draw_polyline(
+        ax,
+        dxf.get("points", []),
+        options.line_width,
+        color=color,
+        closed=bool(dxf.get("closed", False)),
+        arc_segments=options.arc_segments,
+    )
+
+
+def _plot_closed_polyline(ax, dxf, color, options: _PlotOptions):
+    _draw_polyline(
+        ax,
+        dxf.get("points", []),
+        options.line_width,
+        color=color,
+        closed=True,
+        arc_segments=options.arc_segments,
+    )
+
+
+def _plot_open_polyline(ax, dxf, color, options: _PlotOptions):
+    _draw_polyline(
+        ax,
+        dxf.get("points", []),
+        options.line_width,
+        color=color,
+        closed=False,
+        arc_segments=options.arc_segments,
+    )
+
+
+def _plot_polyline_mesh(ax, dxf, color, options: _PlotOptions):
+    _draw_polyline_mesh(
+        ax,
+        dxf.get("points", []),
+        dxf.get("m_vertex_count", 0),
+        dxf.get("n_vertex_count", 0),
+        bool(dxf.get("closed", False)),
+        options.line_width,
+        color=color,
+        arc_segments=options.arc_segments,
+    )
+
+
+def _plot_polyline_pface(ax, dxf, color, options: _PlotOptions):
+    _draw_polyline_pface(
+        ax,
+        dxf.get("vertices", []),
+        dxf.get("faces", []),
+        options.line_width,
+        color=color,
+        arc_segments=options.arc_segments,
+    )
+
+
+def _plot_3dface(ax, dxf, color, options: _PlotOptions):
+    _draw_3dface(
+        ax,
+        dxf.get("points", []),
+        int(dxf.get("invisible_edge_flags", 0)),
+        options.line_width,
+        color=color,
+    )
+
+
+def _plot_arc(ax, dxf, color, options: _PlotOptions):
+    _draw_arc(
+        ax,
+        dxf["center"],
+        dxf["radius"],
+        dxf["start_angle"],
+        dxf["end_angle"],
+        options.arc_segments,
+        options.line_width,
+        color=color,
+    )
+
+
+def _plot_circle(ax, dxf, color, options: _PlotOptions):
+    _draw_circle(
+        ax,
+        dxf["center"],
+        dxf["radius"],
+        options.arc_segments,
+        options.line_width,
+        color=color,
+    )
+
+
+def _plot_ellipse(ax, dxf, color, options: _PlotOptions):
+    _draw_ellipse(
+        ax,
+        dxf["center"],
+        dxf["major_axis"],
+        dxf["axis_ratio"],
+        dxf["start_angle"],
+        dxf["end_angle"],
+        options.arc_segments,
+        options.line_width,
+        color=color,
+    )
+
+
+def _plot_text(ax, dxf, color, options: _PlotOptions):
+    _draw_text(
+        ax,
+        dxf.get("insert", (0.0, 0.0, 0.0)),
+        dxf.get("text", ""),
+        dxf.get("height", 1.0),
+        dxf.get("rotation", 0.0),
+        color=color,
+    )
+
+
+def _plot_mtext(ax, dxf, color, options: _PlotOptions):
+    _draw_text(
+        ax,
+        dxf.get("insert", (0.0, 0.0, 0.0)),
+        dxf.get("text", ""),
+        dxf.get("char_height", 1.0),
+        dxf.get("rotation", 0.0),
+        color=color,
+        background=_resolve_mtext_background_bbox(ax, dxf),
+    )
+
+
+def _plot_hatch(ax, dxf, color, options: _PlotOptions):
+    for path in dxf.get("paths", []):
+        points = path.get("points", []) if isinstance(path, dict) else []
+        closed = bool(path.get("closed", False)) if isinstance(path, dict) else False
+        _draw_polyline(
+            ax,
+            points,
+            options.line_width,
+            color=color,
+            closed=closed,
+            arc_segments=options.arc_segments,
+        )
+
+
+def _plot_tolerance(ax, dxf, color, options: _PlotOptions):
+    text_height = dxf.get("height", 1.0)
     try:
-        import matplotlib.pyplot as plt
-    except Exception as exc:
-        raise ImportError(
-            "matplotlib is required for plotting. "
-            "Install it with `pip install matplotlib`."
-        ) from exc
-    return plt
+        text_height = float(text_height)
+    except Exception:
+        text_height = 1.0
+    if text_height <= 0.0:
+        text_height = 1.0
+    _draw_text(
+        ax,
+        dxf.get("insert", (0.0, 0.0, 0.0)),
+        dxf.get("text", ""),
+        text_height,
+        dxf.get("rotation", 0.0),
+        color=color,
+    )
+
+
+def _plot_dimension(ax, dxf, color, options: _PlotOptions):
+    dim_color = color if options.dimension_color is None else options.dimension_color
+    _draw_dimension(ax, dxf, options.line_width, color=dim_color)
+
+
+_PLOT_DISPATCH: dict[str, Callable[[Any, dict, Any, _PlotOptions], None]] = {
+    "LINE": _plot_line,
+    "POINT": _plot_point,
+    "LWPOLYLINE": _plot_lwpolyline,
+    "POLYLINE_3D": _plot_polyline,
+    "POLYLINE_MESH": _plot_polyline_mesh,
+    "POLYLINE_PFACE": _plot_polyline_pface,
+    "3DFACE": _plot_3dface,
+    "SOLID": _plot_closed_polyline,
+    "TRACE": _plot_closed_polyline,
+    "SHAPE": _plot_insert_point,
+    "ARC": _plot_arc,
+    "CIRCLE": _plot_circle,
+    "ELLIPSE": _plot_ellipse,
+    "SPLINE": _plot_polyline,
+    "TEXT": _plot_text,
+    "ATTRIB": _plot_text,
+    "ATTDEF": _plot_text,
+    "MTEXT": _plot_mtext,
+    "LEADER": _plot_open_polyline,
+    "HATCH": _plot_hatch,
+    "TOLERANCE": _plot_tolerance,
+    "MLINE": _plot_polyline,
+    "MINSERT": _plot_insert_point,
+    "DIMENSION": _plot_dimension,
+}
+
+
+class _LineBatch:
+    def __init__(self, ax):
+        self._ax = ax
+        self._kind = None
+        self._xy: list = []
+        self._colors: list = []
+        self._widths: list = []
+        self._sizes: list = []
+        self.drawn: list = []
+
+    def __getattr__(self, name):
+        return getattr(self._ax, name)
+
+    def plot(self, xs, ys, linewidth=None, color=None, **kwargs):
+        if kwargs or color is None or linewidth is None:
+            self.flush()
+            return self._ax.plot(xs, ys, linewidth=linewidth, color=color, **kwargs)
+        if self._kind != "lines":
+            self.flush()
+            self._kind = "lines"
+        self._xy.append(np.column_stack((xs, ys)))
+        self._colors.append(color)
+        self._widths.append(linewidth)
+        return None
+
+    def scatter(self, xs, ys, s=None, color=None, marker="o", linewidths=None, **kwargs):
+        if kwargs or color is None or s is None or linewidths is None:
+            self.flush()
+            return self._ax.scatter(
+                xs, ys, s=s, color=color, marker=marker, linewidths=linewidths, **kwargs
+            )
+        if self._kind != ("scatter", marker):
+            self.flush()
+            self._kind = ("scatter", marker)
+        for xy in zip(xs, ys):
+            self._xy.append(xy)
+            self._colors.append(color)
+            self._widths.append(linewidths)
+            self._sizes.append(s)
+        return None
+
+    def flush(self):
+        kind = self._kind
+        if kind is None:
+            return
+        if kind == "lines":
+            from matplotlib import rcParams
+            from matplotlib.collections import LineCollection
+
+            collection = self._ax.add_collection(
+                LineCollection(
+                    self._xy,
+                    colors=self._colors,
+                    linewidths=self._widths,
+                    capstyle=rcParams["lines.solid_capstyle"],
+                    joinstyle=rcParams["lines.solid_joinstyle"],
+                    zorder=2,
+                )
+            )
+        else:
+            xs, ys = zip(*self._xy)
+            collection = self._ax.scatter(
+                xs,
+                ys,
+                s=self._sizes,
+                color=self._colors,
+                marker=kind[1],
+                linewidths=self._widths,
+                zorder=2,
+            )
+        self.drawn.append(collection)
+        self._kind = None
+        self._xy = []
+        self._colors = []
+        self._widths = []
+        self._sizes = []
+
+
+def _require_matplotlib():
+    global _PYPLOT
+    if _PYPLOT is None:
+        try:
+            import matplotlib.pyplot as plt
+        except Exception as exc:
+            raise ImportError(
+                "matplotlib is required for plotting. "
+                "Install it with `pip install matplotlib`."
+            ) from exc
+        _PYPLOT = plt
+    return _PYPLOT
 
 
 def _resolve_layout(target: Any):
@@ -275,16 +413,25 @@ def _resolve_layout(target: Any):
 
 
 def _resolve_dwg_color(dxf):
-    true_color = dxf.get("resolved_true_color")
-    if true_color is None:
-        true_color = dxf.get("true_color")
+    get = dxf.get
+    return _dwg_color_hex(
+        get("resolved_true_color"),
+        get("true_color"),
+        get("resolved_color_index"),
+        get("color_index"),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _dwg_color_hex(resolved_true_color, true_color, resolved_index, index):
+    if resolved_true_color is not None:
+        true_color = resolved_true_color
     color = _true_color_to_hex(true_color)
     if color is not None:
         return color
 
-    index = dxf.get("resolved_color_index")
-    if index is None:
-        index = dxf.get("color_index")
+    if resolved_index is not None:
+        index = resolved_index
     if index is not None:
         try:
             aci = int(index)
@@ -309,8 +456,12 @@ def _true_color_to_hex(value):
 
 
 def _aci_to_hex(index: int):
-    if index <= 0:
-        return None
+    if 0 < index < 256:
+        return _ACI_HEX_TABLE[index]
+    return None
+
+
+def _aci_rgb(index: int):
     base = {
         1: (255, 0, 0),
         2: (255, 255, 0),
@@ -327,9 +478,7 @@ def _aci_to_hex(index: int):
     rgb = base.get(index)
     if rgb is None:
         rgb = _aci_approx_rgb(index)
-    if rgb is None:
-        return None
-    return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+    return rgb
 
 
 def _aci_approx_rgb(index: int):
@@ -350,13 +499,19 @@ def _aci_approx_rgb(index: int):
     return None
 
 
+_ACI_HEX_TABLE: tuple[str | None, ...] = tuple(
+    None if index == 0 else "#{:02x}{:02x}{:02x}".format(*_aci_rgb(index))
+    for index in range(256)
+)
+
+
 def _draw_line(ax, start, end, line_width: float, color=None):
     ax.plot([start[0], end[0]], [start[1], end[1]], linewidth=line_width, color=color)
 
 
 def _draw_point(ax, location, line_width: float, color=None):
     size = max(2.0, line_width * 4.0)
-    ax.plot([location[0]], [location[1]], marker="o", markersize=size, linewidth=0, color=color)
+    ax.scatter([location[0]], [location[1]], s=size * size, color=color, marker="o", linewidths=0)
 
 
 def _draw_polyline(
@@ -371,11 +526,9 @@ def _draw_polyline(
     if not points:
         return
     path = _build_lwpolyline_path(points, bulges=bulges, closed=closed, arc_segments=arc_segments)
-    if not path:
+    if len(path) == 0:
         return
-    xs = [pt[0] for pt in path]
-    ys = [pt[1] for pt in path]
-    ax.plot(xs, ys, linewidth=line_width, color=color)
+    ax.plot(path[:, 0], path[:, 1], linewidth=line_width, color=color)
 
 
 def _draw_polyline_mesh(
@@ -514,9 +667,9 @@ def _build_lwpolyline_path(points, bulges=None, closed: bool = False, arc_segmen
             points2d.append(xy)
     count = len(points2d)
     if count == 0:
-        return []
+        return np.empty((0, 2))
     if count == 1:
-        return [points2d[0]]
+        return np.array(points2d, dtype=float)
 
     bulge_values = [0.0] * count
     if bulges:
@@ -527,36 +680,51 @@ def _build_lwpolyline_path(points, bulges=None, closed: bool = False, arc_segmen
                 bulge_values[idx] = 0.0
 
     seg_count = count if closed else (count - 1)
-    path: list[tuple[float, float]] = []
+    arcs = {}
+    total = 1 + seg_count
     for idx in range(seg_count):
+        bulge = bulge_values[idx]
+        if abs(bulge) <= 1.0e-12:
+            continue
         start = points2d[idx]
         end = points2d[(idx + 1) % count]
-        bulge = bulge_values[idx]
         segment = _segment_path_with_bulge(start, end, bulge, arc_segments=arc_segments)
-        if not segment:
-            continue
-        if path:
-            path.extend(segment[1:])
+        arcs[idx] = segment
+        total += len(segment) - 2
+
+    if closed:
+        points2d.append(points2d[0])
+    if not arcs:
+        return np.array(points2d, dtype=float)
+
+    path = np.empty((total, 2))
+    path[0] = points2d[0]
+    offset = 1
+    for idx in range(seg_count):
+        segment = arcs.get(idx)
+        if segment is None:
+            path[offset] = points2d[idx + 1]
+            offset += 1
         else:
-            path.extend(segment)
+            size = len(segment) - 1
+            path[offset : offset + size] = segment[1:]
+            offset += size
     return path
 
 
 def _segment_path_with_bulge(start, end, bulge: float, arc_segments: int):
-    import math
-
     if abs(bulge) <= 1.0e-12:
-        return [start, end]
+        return np.array((start, end), dtype=float)
 
     dx = end[0] - start[0]
     dy = end[1] - start[1]
     chord = math.hypot(dx, dy)
     if chord <= 1.0e-12:
-        return [start, end]
+        return np.array((start, end), dtype=float)
 
     theta = 4.0 * math.atan(bulge)
     if abs(theta) <= 1.0e-12:
-        return [start, end]
+        return np.array((start, end), dtype=float)
 
     normal = (-dy / chord, dx / chord)
     center_offset = chord * (1.0 - bulge * bulge) / (4.0 * bulge)
@@ -567,15 +735,14 @@ def _segment_path_with_bulge(start, end, bulge: float, arc_segments: int):
     )
     radius = math.hypot(start[0] - center[0], start[1] - center[1])
     if radius <= 1.0e-12:
-        return [start, end]
+        return np.array((start, end), dtype=float)
 
     start_angle = math.atan2(start[1] - center[1], start[0] - center[0])
     segments = max(2, int(math.ceil(abs(theta) * max(8, arc_segments) / (2.0 * math.pi))))
-    out = []
-    for i in range(segments + 1):
-        t = i / segments
-        angle = start_angle + theta * t
-        out.append((center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle)))
+    angles = start_angle + theta * np.linspace(0.0, 1.0, segments + 1)
+    out = np.empty((segments + 1, 2))
+    out[:, 0] = center[0] + radius * np.cos(angles)
+    out[:, 1] = center[1] + radius * np.sin(angles)
     out[0] = start
     out[-1] = end
     return out
@@ -591,22 +758,16 @@ def _draw_arc(
     line_width: float,
     color=None,
 ):
-    import math
-
     if segments < 4:
         segments = 4
     start = start_angle
     end = end_angle
     if end < start:
         end += 360.0
-    step = (end - start) / segments
-
-    xs = []
-    ys = []
-    for i in range(segments + 1):
-        angle = math.radians(start + step * i)
-        xs.append(center[0] + radius * math.cos(angle))
-        ys.append(center[1] + radius * math.sin(angle))
+
+    angles = np.radians(np.linspace(start, end, segments + 1))
+    xs = center[0] + radius * np.cos(angles)
+    ys = center[1] + radius * np.sin(angles)
     ax.plot(xs, ys, linewidth=line_width, color=color)
 
 
@@ -625,8 +786,6 @@ def _draw_ellipse(
     line_width: float,
     color=None,
 ):
-    import math
-
     if segments < 16:
         segments = 16
 
@@ -640,15 +799,11 @@ def _draw_ellipse(
     vx = -my * axis_ratio
     vy = mx * axis_ratio
 
-    step = (end - start) / segments
-    xs = []
-    ys = []
-    for i in range(segments + 1):
-        t = start + step * i
-        c = math.cos(t)
-        s = math.sin(t)
-        xs.append(center[0] + mx * c + vx * s)
-        ys.append(center[1] + my * c + vy * s)
+    t = np.linspace(start, end, segments + 1)
+    c = np.cos(t)
+    s = np.sin(t)
+    xs = center[0] + mx * c + vx * s
+    ys = center[1] + my * c + vy * s
     ax.plot(xs, ys, linewidth=line_width, color=color)
 
 
@@ -770,10 +925,19 @@ def _draw_dimension(ax, dxf, line_width: float, color=None):
     if dim_dir is None:
         return
 
-    normal = (-dim_dir[1], dim_dir[0])
-    oblique_deg = _dimension_value(dxf, "oblique_angle", 0.0) or 0.0
-    ext_dir = _rotate2(normal, _deg_to_rad(oblique_deg))
-    ext_dir = _normalize2(ext_dir) or normal
+    nx = -dim_dir[1]
+    ny = dim_dir[0]
+    normal = (nx, ny)
+    oblique_rad = math.radians(float(_dimension_value(dxf, "oblique_angle", 0.0) or 0.0))
+    c = math.cos(oblique_rad)
+    s = math.sin(oblique_rad)
+    ext_x = nx * c - ny * s
+    ext_y = nx * s + ny * c
+    ext_len = math.hypot(ext_x, ext_y)
+    if math.isfinite(ext_len) and ext_len >= 1.0e-12:
+        ext_dir = (ext_x / ext_len, ext_y / ext_len)
+    else:
+        ext_dir = normal
 
     i13 = _line_line_intersection_2d((p13[0], p13[1]), ext_dir, (p10[0], p10[1]), dim_dir)
     i14 = _line_line_intersection_2d((p14[0], p14[1]), ext_dir, (p10[0], p10[1]), dim_dir)
@@ -910,17 +1074,15 @@ def _apply_equal_limits(ax):
     ax.set_ylim(cy - half, cy + half)
 
 
-def _apply_auto_limits(ax, equal: bool, margin: float):
-    points = _collect_axes_points(ax)
-    if not points:
+def _apply_auto_limits(ax, collections, equal: bool, margin: float):
+    xs, ys = _collect_axes_points(ax, collections)
+    if len(xs) == 0:
         ax.autoscale(True)
         if equal:
             _apply_equal_limits(ax)
             ax.set_aspect("equal", adjustable="box")
         return
 
-    xs = [p[0] for p in points]
-    ys = [p[1] for p in points]
     full = _bounds_from_xy(xs, ys)
     robust = _robust_bounds(xs, ys, q_low=0.02, q_high=0.98)
     chosen = _choose_bounds(full, robust)
@@ -938,21 +1100,27 @@ def _apply_auto_limits(ax, equal: bool, margin: float):
     ax.set_ylim(y0, y1)
 
 
-def _collect_axes_points(ax):
-    import math
-
-    points = []
+def _collect_axes_points(ax, collections):
+    xs_parts = []
+    ys_parts = []
     for line in ax.lines:
-        xs = line.get_xdata()
-        ys = line.get_ydata()
-        for x, y in zip(xs, ys):
-            try:
-                xf = float(x)
-                yf = float(y)
-            except Exception:
-                continue
-            if math.isfinite(xf) and math.isfinite(yf):
-                points.append((xf, yf))
+        try:
+            xs = np.asarray(line.get_xdata(), dtype=float)
+            ys = np.asarray(line.get_ydata(), dtype=float)
+        except (TypeError, ValueError):
+            continue
+        count = min(len(xs), len(ys))
+        xs_parts.append(xs[:count])
+        ys_parts.append(ys[:count])
+    for collection in collections:
+        get_segments = getattr(collection, "get_segments", None)
+        segments = [collection.get_offsets()] if get_segments is None else get_segments()
+        for segment in segments:
+            segment = np.asarray(segment, dtype=float).reshape(-1, 2)
+            xs_parts.append(segment[:, 0])
+            ys_parts.append(segment[:, 1])
+    text_xs = []
+    text_ys = []
     for text in ax.texts:
         x, y = text.get_position()
         try:
@@ -960,24 +1128,28 @@ def _collect_axes_points(ax):
             yf = float(y)
         except Exception:
             continue
-        if math.isfinite(xf) and math.isfinite(yf):
-            points.append((xf, yf))
-    return points
+        text_xs.append(xf)
+        text_ys.append(yf)
+    xs_parts.append(np.asarray(text_xs, dtype=float))
+    ys_parts.append(np.asarray(text_ys, dtype=float))
+
+    xs = np.concatenate(xs_parts)
+    ys = np.concatenate(ys_parts)
+    finite = np.isfinite(xs) & np.isfinite(ys)
+    return xs[finite], ys[finite]
 
 
 def _bounds_from_xy(xs, ys):
-    if not xs or not ys:
+    if len(xs) == 0 or len(ys) == 0:
         return None
-    return (min(xs), max(xs), min(ys), max(ys))
+    return (float(xs.min()), float(xs.max()), float(ys.min()), float(ys.max()))
 
 
 def _robust_bounds(xs, ys, q_low: float, q_high: float):
     if len(xs) < 16 or len(ys) < 16:
         return None
-    x0 = _quantile(xs, q_low)
-    x1 = _quantile(xs, q_high)
-    y0 = _quantile(ys, q_low)
-    y1 = _quantile(ys, q_high)
+    x0, x1 = (float(v) for v in np.quantile(xs, (q_low, q_high)))
+    y0, y1 = (float(v) for v in np.quantile(ys, (q_low, q_high)))
     if x1 <= x0 or y1 <= y0:
         return None
     return (x0, x1, y0, y1)
@@ -1015,24 +1187,7 @@ def _square_bounds(x0, x1, y0, y1):
     return (cx - half, cx + half, cy - half, cy + half)
 
 
-def _quantile(values, q: float):
-    data = sorted(float(v) for v in values)
-    if not data:
-        return 0.0
-    if len(data) == 1:
-        return data[0]
-    qn = min(1.0, max(0.0, float(q)))
-    pos = qn * (len(data) - 1)
-    i = int(pos)
-    frac = pos - i
-    if i >= len(data) - 1:
-        return data[-1]
-    return data[i] * (1.0 - frac) + data[i + 1] * frac
-
-
 def _to_xy(value):
-    import math
-
     try:
         x = float(value[0])
         y = float(value[1])
@@ -1044,6 +1199,10 @@ def _to_xy(value):
 
 
 def _as_int(value, default: int = 0) -> int:
+    if type(value) is int:
+        return value
+    if value is None:
+        return default
     try:
         return int(value)
     except Exception:
@@ -1051,8 +1210,6 @@ def _as_int(value, default: int = 0) -> int:
 
 
 def _safe_point(value):
-    import math
-
     if not isinstance(value, tuple) or len(value) < 2:
         return None
     x = float(value[0])
@@ -1073,15 +1230,7 @@ def _is_origin_point(point):
     return abs(point[0]) < eps and abs(point[1]) < eps and abs(point[2]) < eps
 
 
-def _deg_to_rad(value):
-    import math
-
-    return math.radians(float(value))
-
-
 def _direction_from_angle(value):
-    import math
-
     if value is None:
         return None
     try:
@@ -1095,8 +1244,6 @@ def _direction_from_angle(value):
 
 
 def _normalize2(vec):
-    import math
-
     vx, vy = vec
     length = math.hypot(vx, vy)
     if not math.isfinite(length) or length < 1.0e-12:
@@ -1104,14 +1251,6 @@ def _normalize2(vec):
     return (vx / length, vy / length)
 
 
-def _rotate2(vec, rad):
-    import math
-
-    c = math.cos(rad)
-    s = math.sin(rad)
-    return (vec[0] * c - vec[1] * s, vec[0] * s + vec[1] * c)
-
-
 def _cross2(a, b):
     return a[0] * b[1] - a[1] * b[0]
 
@@ -1136,8 +1275,6 @@ def _project_to_line_2d(point, line_point, line_dir):
 
 
 def _distance2(a, b):
-    import math
-
     return math.hypot(b[0] - a[0], b[1] - a[1])
 
 
@@ -1167,8 +1304,9 @@ def _resolve_dimension_text(dxf, text):
 
 
 def _dimension_value(dxf, key, default=None):
-    if key in dxf:
-        return dxf.get(key, default)
+    value = dxf.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
     common = dxf.get("common")
     if isinstance(common, dict):
         return common.get(key, default)
@@ -3,8 +3,19 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(autouse=True)
+def _clear_document_caches():
+    from ezdwg.document import Document
+
+    Document.clear_cache()
+    yield
+    Document.clear_cache()
@@ -8,8 +8,6 @@ import ezdwg.document as document_module
 def _patch_empty_color_maps(monkeypatch) -> None:
     monkeypatch.setattr(document_module.raw, "decode_entity_styles", lambda _path: [])
     monkeypatch.setattr(document_module.raw, "decode_layer_colors", lambda _path: [])
-    document_module._entity_style_map.cache_clear()
-    document_module._layer_color_map.cache_clear()
 
 
 def test_query_attrib_maps_text_and_attribute_fields(monkeypatch) -> None:
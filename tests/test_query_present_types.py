@@ -67,7 +67,6 @@ def test_query_none_skips_absent_entity_decoders(monkeypatch) -> None:
 
 def test_query_uses_bulk_line_arc_circle_decoder(monkeypatch) -> None:
     document_module._present_supported_types.cache_clear()
-    document_module._line_arc_circle_rows.cache_clear()
 
     monkeypatch.setattr(
         document_module.raw,
@@ -112,7 +111,6 @@ def test_query_uses_bulk_line_arc_circle_decoder(monkeypatch) -> None:
 
 def test_query_single_type_does_not_force_bulk_line_arc_circle_decoder(monkeypatch) -> None:
     document_module._present_supported_types.cache_clear()
-    document_module._line_arc_circle_rows.cache_clear()
 
     monkeypatch.setattr(
         document_module.raw,
@@ -135,3 +133,203 @@ def test_query_single_type_does_not_force_bulk_line_arc_circle_decoder(monkeypat
     doc = document_module.Document(path="dummy.dwg", version="AC1018")
     entities = list(doc.modelspace().query("LINE"))
     assert [entity.dxftype for entity in entities] == ["LINE"]
+
+
+def test_query_reuses_decoded_rows_until_cache_cleared(monkeypatch) -> None:
+    calls = []
+
+    monkeypatch.setattr(
+        document_module.raw,
+        "list_object_headers_with_type",
+        lambda _path: [(1, 0, 0, 0x13, "LINE", "Entity")],
+    )
+    monkeypatch.setattr(document_module.raw, "decode_entity_styles", lambda _path: [])
+    monkeypatch.setattr(document_module.raw, "decode_layer_colors", lambda _path: [])
+
+    def _decode_line_entities(_path):
+        calls.append(_path)
+        return [(1, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0)]
+
+    monkeypatch.setattr(document_module.raw, "decode_line_entities", _decode_line_entities)
+
+    doc = document_module.Document(path="dummy.dwg", version="AC1018")
+    first = list(doc.modelspace().query("LINE"))
+    second = doc.modelspace().entities("LINE")
+    assert first == second
+    assert len(calls) == 1
+
+    document_module.Document.clear_cache()
+    list(doc.modelspace().query("LINE"))
+    assert len(calls) == 2
+
+
+def test_query_returns_fresh_dxf_dicts(monkeypatch) -> None:
+    monkeypatch.setattr(
+        document_module.raw,
+        "list_object_headers_with_type",
+        lambda _path: [(1, 0, 0, 0x13, "LINE", "Entity")],
+    )
+    monkeypatch.setattr(document_module.raw, "decode_entity_styles", lambda _path: [])
+    monkeypatch.setattr(document_module.raw, "decode_layer_colors", lambda _path: [])
+    monkeypatch.setattr(
+        document_module.raw,
+        "decode_line_entities",
+        lambda _path: [(1, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0)],
+    )
+
+    doc = document_module.Document(path="dummy.dwg", version="AC1018")
+    first = doc.modelspace().entities("LINE")[0]
+    first.dxf["end"] = (9.0, 9.0, 9.0)
+
+    second = document_module.Document(path="dummy.dwg", version="AC1018")
+    entity = second.modelspace().entities("LINE")[0]
+    assert entity.dxf is not first.dxf
+    assert entity.dxf["end"] == (2.0, 0.0, 0.0)
+
+
+def test_query_single_type_reuses_bulk_line_arc_circle_rows(monkeypatch) -> None:
+    monkeypatch.setattr(
+        document_module.raw,
+        "list_object_headers_with_type",
+        lambda _path: [
+            (1, 0, 0, 0x13, "LINE", "Entity"),
+            (2, 0, 0, 0x11, "ARC", "Entity"),
+        ],
+    )
+    monkeypatch.setattr(document_module, "_entity_style_map", lambda _path: {})
+    monkeypatch.setattr(document_module, "_layer_color_map", lambda _path: {})
+    monkeypatch.setattr(
+        document_module.raw,
+        "decode_line_arc_circle_entities",
+        lambda _path: (
+            [(1, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0)],
+            [(2, 0.0, 0.0, 0.0, 1.0, 0.0, math.pi / 2.0)],
+            [],
+        ),
+    )
+    monkeypatch.setattr(
+        document_module.raw,
+        "decode_line_entities",
+        lambda _path: (_ for _ in ()).throw(AssertionError("LINE should not be decoded twice")),
+    )
+
+    doc = document_module.Document(path="dummy.dwg", version="AC1018")
+    assert len(doc.modelspace().entities("LINE ARC")) == 2
+    assert [entity.handle for entity in doc.modelspace().query("LINE")] == [1]
+
+
+def test_query_redecodes_after_file_changes(monkeypatch, tmp_path) -> None:
+    path = tmp_path / "changing.dwg"
+    path.write_bytes(b"AC1018")
+    calls = []
+
+    monkeypatch.setattr(
+        document_module.raw,
+        "list_object_headers_with_type",
+        lambda _path: [(1, 0, 0, 0x13, "LINE", "Entity")],
+    )
+    monkeypatch.setattr(document_module.raw, "decode_entity_styles", lambda _path: [])
+    monkeypatch.setattr(document_module.raw, "decode_layer_colors", lambda _path: [])
+
+    def _decode_line_entities(_path):
+        calls.append(_path)
+        return [(1, 0.0, 0.0, 0.0, float(len(calls)), 0.0, 0.0)]
+
+    monkeypatch.setattr(document_module.raw, "decode_line_entities", _decode_line_entities)
+
+    doc = document_module.Document(path=str(path), version="AC1018")
+    assert list(doc.modelspace().query("LINE"))[0].dxf["end"] == (1.0, 0.0, 0.0)
+    assert list(doc.modelspace().query("LINE"))[0].dxf["end"] == (1.0, 0.0, 0.0)
+
+    path.write_bytes(b"AC1018 changed")
+    assert list(doc.modelspace().query("LINE"))[0].dxf["end"] == (2.0, 0.0, 0.0)
+    assert len(calls) == 2
+
+
+def test_file_change_keeps_other_paths_cached(monkeypatch, tmp_path) -> None:
+    changing = tmp_path / "changing.dwg"
+    stable = tmp_path / "stable.dwg"
+    changing.write_bytes(b"AC1018")
+    stable.write_bytes(b"AC1018")
+    calls = []
+
+    monkeypatch.setattr(
+        document_module.raw,
+        "list_object_headers_with_type",
+        lambda _path: [(1, 0, 0, 0x13, "LINE", "Entity")],
+    )
+    monkeypatch.setattr(document_module.raw, "decode_entity_styles", lambda _path: [])
+    monkeypatch.setattr(document_module.raw, "decode_layer_colors", lambda _path: [])
+
+    def _decode_line_entities(_path):
+        calls.append(_path)
+        return [(1, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0)]
+
+    monkeypatch.setattr(document_module.raw, "decode_line_entities", _decode_line_entities)
+
+    changing_doc = document_module.Document(path=str(changing), version="AC1018")
+    stable_doc = document_module.Document(path=str(stable), version="AC1018")
+    changing_doc.modelspace().entities("LINE")
+    stable_doc.modelspace().entities("LINE")
+
+    changing.write_bytes(b"AC1018 changed")
+    stable_doc.modelspace().entities("LINE")
+    changing_doc.modelspace().entities("LINE")
+    assert calls == [str(changing), str(stable), str(changing)]
+
+
+def test_iter_batches_groups_query_results(monkeypatch) -> None:
+    monkeypatch.setattr(
+        document_module.raw,
+        "list_object_headers_with_type",
+        lambda _path: [(1, 0, 0, 0x13, "LINE", "Entity")],
+    )
+    monkeypatch.setattr(document_module, "_entity_style_map", lambda _path: {})
+    monkeypatch.setattr(document_module, "_layer_color_map", lambda _path: {})
+    monkeypatch.setattr(
+        document_module.raw,
+        "decode_line_entities",
+        lambda _path: [(handle, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0) for handle in range(1, 6)],
+    )
+
+    doc = document_module.Document(path="dummy.dwg", version="AC1018")
+    batches = list(doc.modelspace().iter_batches("LINE", batch=2))
+    assert [[entity.handle for entity in batch] for batch in batches] == [[1, 2], [3, 4], [5]]
+
+
+def test_query_stats_the_file_once(monkeypatch, tmp_path) -> None:
+    path = tmp_path / "stamped.dwg"
+    path.write_bytes(b"AC1018")
+    stamps = []
+    file_stamp = document_module._file_stamp
+
+    def _counting_file_stamp(_path):
+        stamps.append(_path)
+        return file_stamp(_path)
+
+    monkeypatch.setattr(document_module, "_file_stamp", _counting_file_stamp)
+    monkeypatch.setattr(
+        document_module.raw,
+        "list_object_headers_with_type",
+        lambda _path: [
+            (1, 0, 0, 0x13, "LINE", "Entity"),
+            (2, 0, 0, 0x11, "ARC", "Entity"),
+            (3, 0, 0, 0x1B, "POINT", "Entity"),
+        ],
+    )
+    monkeypatch.setattr(document_module.raw, "decode_entity_styles", lambda _path: [])
+    monkeypatch.setattr(document_module.raw, "decode_layer_colors", lambda _path: [])
+    monkeypatch.setattr(
+        document_module.raw,
+        "decode_line_arc_circle_entities",
+        lambda _path: ([(1, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0)], [], []),
+    )
+    monkeypatch.setattr(
+        document_module.raw,
+        "decode_point_entities",
+        lambda _path: [(3, 1.0, 2.0, 0.0, 0.0)],
+    )
+
+    doc = document_module.Document(path=str(path), version="AC1018")
+    assert len(doc.modelspace().entities()) == 2
+    assert stamps == [str(path)]
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 
+import pytest
+
 import ezdwg.render as render_module
 
 
@@ -132,8 +134,8 @@ def test_build_lwpolyline_path_expands_bulge_arc() -> None:
         arc_segments=32,
     )
     assert len(path) > 2
-    assert path[0] == (0.0, 0.0)
-    assert path[-1] == (1.0, 0.0)
+    assert tuple(path[0]) == (0.0, 0.0)
+    assert tuple(path[-1]) == (1.0, 0.0)
     assert max(abs(y) for _x, y in path) > 0.45
 
 
@@ -568,3 +570,61 @@ def test_plot_layout_mline_uses_polyline_drawer(monkeypatch) -> None:
     render_module.plot_layout(layout, ax=ax, show=False, auto_fit=False, equal=False)
 
     assert captured == [([(0.0, 0.0, 0.0), (2.0, 0.0, 0.0), (2.0, 1.0, 0.0)], True)]
+
+
+def test_plot_layout_batches_lines_into_one_collection() -> None:
+    pytest.importorskip("matplotlib")
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    layout = _FakeLayout(
+        [
+            SimpleNamespace(
+                dxftype="LINE",
+                dxf={"start": (0.0, 0.0, 0.0), "end": (1.0, 0.0, 0.0), "resolved_color_index": 1},
+            ),
+            SimpleNamespace(
+                dxftype="LINE",
+                dxf={"start": (0.0, 1.0, 0.0), "end": (1.0, 1.0, 0.0), "resolved_color_index": 1},
+            ),
+        ]
+    )
+    fig, ax = plt.subplots()
+    try:
+        render_module.plot_layout(layout, ax=ax, show=False)
+        assert len(ax.lines) == 0
+        assert len(ax.collections) == 1
+        assert len(ax.collections[0].get_segments()) == 2
+    finally:
+        plt.close(fig)
+
+
+def test_plot_layout_auto_fit_ignores_foreign_collections() -> None:
+    pytest.importorskip("matplotlib")
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    layout = _FakeLayout(
+        [
+            SimpleNamespace(
+                dxftype="LINE",
+                dxf={"start": (10.0, 10.0, 0.0), "end": (11.0, 11.0, 0.0), "resolved_color_index": 1},
+            ),
+            SimpleNamespace(
+                dxftype="POINT",
+                dxf={"location": (10.5, 10.5, 0.0), "resolved_color_index": 1},
+            ),
+        ]
+    )
+    fig, ax = plt.subplots()
+    try:
+        ax.fill_between([10.0, 11.0], [10.0, 10.0], [11.0, 11.0])
+        render_module.plot_layout(layout, ax=ax, show=False, equal=False)
+        assert ax.get_xlim()[0] > 9.0
+        assert ax.get_ylim()[0] > 9.0
+    finally:
+        plt.close(fig)
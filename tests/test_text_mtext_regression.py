@@ -96,3 +96,10 @@ def test_mtext_string_matches_paired_dxf() -> None:
         assert len(entities) == 1
         # High-level API returns normalized plain text.
         assert dxf_text in entities[0].dxf["text"] or entities[0].dxf["text"] in dxf_text
+
+
+def test_decode_mtext_plain_text_handles_escapes() -> None:
+    from ezdwg.document import _decode_mtext_plain_text
+
+    value = r"{\fArial|b0;\C1;Line\P2\~x\U+00B0 \S1#2;\\\{\}\Lend\l}"
+    assert _decode_mtext_plain_text(value + "\\") == "Line\n2 x° 1/2\\{}end\\"